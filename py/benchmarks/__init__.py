@@ -0,0 +1,8 @@
+"""timing and memory benchmarks for cc3
+
+run from the py directory:
+    python -m benchmarks run --output results.json
+    python -m benchmarks compare results.json baseline.json"""
+
+from .cases import all_cases, build_graph
+from .runner import run, compare, save_results, load_results
@@ -0,0 +1,61 @@
+import argparse, sys
+
+from .cases import all_cases
+from .runner import run, compare, save_results, load_results, default_sizes, full_sizes
+
+
+def main(argv = None) -> int:
+    parser = argparse.ArgumentParser(prog = "python -m benchmarks", description = "cc3 benchmarks")
+    commands = parser.add_subparsers(dest = "command", required = True)
+
+    run_parser = commands.add_parser("run", help = "run the benchmarks and save the results as json")
+    run_parser.add_argument("--output", default = "bench_results.json")
+    run_parser.add_argument("--sizes", type = int, nargs = "+", default = None)
+    run_parser.add_argument("--full", action = "store_true", help = "benchmark orders 10^3 to 10^6")
+    run_parser.add_argument("--degrees", type = int, nargs = "+", default = None)
+    run_parser.add_argument("--variants", nargs = "+", default = None, choices = ["list", "matrix", "successor"])
+    run_parser.add_argument("--cases", nargs = "+", default = None, choices = list(all_cases))
+    run_parser.add_argument("--repeat", type = int, default = 3)
+    run_parser.add_argument("--seed", type = int, default = 0)
+    run_parser.add_argument("--directed", action = "store_true")
+    run_parser.add_argument("--baseline", default = None, help = "compare against this result file afterwards")
+    run_parser.add_argument("--threshold", type = float, default = 0.2)
+
+    compare_parser = commands.add_parser("compare", help = "compare two result files")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("--threshold", type = float, default = 0.2)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        sizes = args.sizes or (full_sizes if args.full else default_sizes)
+
+        def log(key: str, result: dict) -> None:
+            if "error" in result:
+                print(f"{key:40} {result['error']}")
+            else:
+                print(f"{key:40} {result['time'] * 1000:12.3f} ms {result['memory'] / 1024:12.1f} KiB")
+
+        current = run(sizes, args.degrees, args.variants, args.cases, args.repeat, args.seed, args.directed, log)
+        save_results(current, args.output)
+        if args.baseline is None:
+            return 0
+        baseline = load_results(args.baseline)
+    else:
+        current = load_results(args.current)
+        baseline = load_results(args.baseline)
+
+    report = compare(current, baseline, args.threshold, args.threshold)
+    for entry in report:
+        flag = "REGRESSION" if entry["regression"] else ""
+        if entry["time_ratio"] is None:
+            print(f"{entry['key']:40} {entry['status']:31} {flag}")
+        else:
+            print(f"{entry['key']:40} time x{entry['time_ratio']:6.2f} memory x{entry['memory_ratio']:6.2f} {flag}")
+
+    return int(any(entry["regression"] for entry in report))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import random
+from collections.abc import Callable
+
+import cc3
+
+# matrix graphs need order² memory, so they are only benchmarked up to this order
+matrix_limit = 10 ** 4
+
+
+def random_edges(order: int, degree: int, seed: int) -> list[tuple[int, int]]:
+    """returns (order * degree / 2) random edges, reproducible by seed"""
+
+    rng = random.Random(seed)
+    return [(rng.randrange(order), rng.randrange(order)) for _ in range(order * degree // 2)]
+
+
+def build_graph(variant: str, order: int, edges: list[tuple[int, int]], directed = False) -> cc3.Graph | cc3.SuccessorGraph:
+    """construct a graph of a variant by calling add_edge for every edge"""
+
+    if variant == "successor":
+        graph = cc3.SuccessorGraph(order)
+    else:
+        graph = cc3.new(variant, order, directed = directed)
+
+    for a, b in edges:
+        graph.add_edge(a, b)
+    return graph
+
+
+def supported(variant: str, order: int) -> bool:
+    """returns whether a variant can reasonably be benchmarked at an order"""
+
+    return variant != "matrix" or order <= matrix_limit
+
+
+# CASES
+# every case receives a context dict and returns a callable that performs the timed work
+def case_construct(context: dict) -> Callable[[], object]:
+    return lambda: build_graph(context["variant"], context["order"], context["edges"], context["directed"])
+
+
+def case_is_edge(context: dict) -> Callable[[], object]:
+    graph, queries = context["graph"], context["queries"]
+    return lambda: [graph.is_edge(a, b) for a, b in queries]
+
+
+def case_out_degree(context: dict) -> Callable[[], object]:
+    graph, queries = context["graph"], context["queries"]
+    return lambda: [graph.out_degree(a) for a, _ in queries]
+
+
+def case_in_degree(context: dict) -> Callable[[], object]:
+    # in_degree scans every edge, so only a few queries are timed
+    graph, queries = context["graph"], context["queries"][:10]
+    return lambda: [graph.in_degree(a) for a, _ in queries]
+
+
+def case_bfs(context: dict) -> Callable[[], object]:
+    return lambda: cc3.bfs(context["graph"], 0)
+
+
+def case_dfs(context: dict) -> Callable[[], object]:
+    return lambda: cc3.dfs(context["graph"], 0)
+
+
+def case_has_cycle(context: dict) -> Callable[[], object]:
+    return lambda: cc3.has_cycle(context["graph"])
+
+
+all_cases = {"construct": case_construct,
+             "is_edge": case_is_edge,
+             "out_degree": case_out_degree,
+             "in_degree": case_in_degree,
+             "bfs": case_bfs,
+             "dfs": case_dfs,
+             "has_cycle": case_has_cycle}
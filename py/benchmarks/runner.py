@@ -0,0 +1,116 @@
+import json, platform, random, sys, time, tracemalloc
+
+from .cases import all_cases, build_graph, random_edges, supported
+
+default_sizes = [10 ** 3, 10 ** 4]
+full_sizes = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+default_degrees = [2, 8]
+default_variants = ["list", "matrix", "successor"]
+
+
+def _measure(function, repeat: int) -> tuple[float, int]:
+    """helper function that returns the best wall time over several runs and the peak traced memory of one run"""
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return best, peak
+
+
+def run(sizes = None, degrees = None, variants = None, names = None, repeat = 3, seed = 0,
+        directed = False, log = None) -> dict:
+    """run the benchmark cases over every size, degree and variant
+
+    returns a dict of results keyed by "variant/case/order/degree" holding time (seconds) and peak memory (bytes).
+    cases that raise (e.g. RecursionError in the recursive traversals) are recorded with their error"""
+
+    sizes = default_sizes if sizes is None else sizes
+    degrees = default_degrees if degrees is None else degrees
+    variants = default_variants if variants is None else variants
+    names = list(all_cases) if names is None else names
+
+    results = {}
+    for variant in variants:
+        for order in sizes:
+            if not supported(variant, order):
+                continue
+
+            for degree in degrees:
+                edges = random_edges(order, degree, seed)
+                rng = random.Random(seed + 1)
+                context = {"variant": variant, "order": order, "edges": edges, "directed": directed,
+                           "queries": [(rng.randrange(order), rng.randrange(order)) for _ in range(1000)]}
+                context["graph"] = build_graph(variant, order, edges, directed)
+
+                for name in names:
+                    key = f"{variant}/{name}/{order}/{degree}"
+                    try:
+                        seconds, peak = _measure(all_cases[name](context), repeat)
+                        results[key] = {"time": seconds, "memory": peak}
+                    except (RecursionError, MemoryError) as error:
+                        results[key] = {"error": type(error).__name__}
+
+                    if log is not None:
+                        log(key, results[key])
+
+    return {"meta": {"python": sys.version.split()[0], "platform": platform.platform(),
+                     "seed": seed, "repeat": repeat, "directed": directed},
+            "results": results}
+
+
+def save_results(results: dict, path: str) -> None:
+    with open(path, "w") as file:
+        json.dump(results, file, indent = 2, sort_keys = True)
+
+
+def load_results(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def _covered(key: str, current: dict) -> bool:
+    """helper function that returns whether the current run included the variant, case, order and degree of a key
+
+    (so baseline keys outside of a partial run, e.g. one with --cases bfs, are not reported as missing)"""
+
+    parts = key.split("/")
+    return all(any(k.split("/")[i] == part for k in current) for i, part in enumerate(parts))
+
+
+def compare(current: dict, baseline: dict, threshold = 0.2, memory_threshold = 0.2) -> list[dict]:
+    """compare results against a baseline
+
+    returns one entry per benchmark, flagged as a regression when time or memory grew by more than
+    the given fraction, when it fails in the current results but not in the baseline ("error"),
+    or when a baseline benchmark that the current run covers has no result ("missing")"""
+
+    current, baseline = current["results"], baseline["results"]
+    report = []
+    for key in sorted(set(current) | set(baseline)):
+        result, base = current.get(key), baseline.get(key)
+        entry = {"key": key, "status": "ok", "time_ratio": None, "memory_ratio": None, "regression": False}
+
+        if result is None:
+            entry.update(status = "missing", regression = _covered(key, current))
+        elif base is None:
+            entry["status"] = "new"
+        elif "error" in result:
+            entry.update(status = result["error"], regression = "error" not in base)
+        elif "error" not in base:
+            entry["time_ratio"] = result["time"] / base["time"] if base["time"] else 1.0
+            entry["memory_ratio"] = result["memory"] / base["memory"] if base["memory"] else 1.0
+            entry["regression"] = entry["time_ratio"] > 1 + threshold or entry["memory_ratio"] > 1 + memory_threshold
+        else:
+            entry["status"] = "fixed"
+        report.append(entry)
+    return report
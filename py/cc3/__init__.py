@@ -1,11 +1,27 @@
 from .graph import *
 from .traversal import *
 from .cycle import *
-from .graphics import display
+from .frozen import FrozenGraph, freeze, from_edges
+from .components import connected_components, component_count, has_cycle_parallel
+from .dag import Condensation, condensation, strongly_connected_components, topological_sort
+from .storage import save, load
+from .edgelist import iter_edgelist, read_edgelist
+from . import generators, instrument
+from .auto import auto, recommend, optimize
+from .keyed import KeyedGraph
+from .view import SubgraphView, subgraph
+from .paths import all_pairs, floyd_warshall, bfs_all_pairs
+from .reach import ReachabilityIndex, reachability_index, reachable, reachable_set
+from .dynamic import DistanceTracker
+from .reorder import reorder
+from .eccentricity import diameter, diameter_bounds, eccentricities
+from .graphics import display, export_frames
+from .layout import LayoutCache, multilevel_layout, cached_layout
 
 graph_variants = {"list": ListGraph,
                   "matrix": MatrixGraph,
-                  "successor": SuccessorGraph}
+                  "successor": SuccessorGraph,
+                  "auto": auto}
 
 
 def new(variant = "list", *args, **kwargs) -> Graph | SuccessorGraph:
@@ -0,0 +1,80 @@
+from typing import Any
+
+from .graph import Graph, ListGraph, MatrixGraph, SuccessorGraph
+
+# a ListGraph pays for an Edge object per stored edge, a MatrixGraph for one slot per vertex pair.
+# above this density (stored edges / order²) the matrix uses less memory and answers is_edge in O(1)
+matrix_density = 0.1
+
+# below this order the matrix is always small enough to be worth its O(1) edge lookups
+matrix_order = 64
+
+# a matrix with more vertex pairs than this is never chosen
+matrix_limit = 1 << 24
+
+
+def _stored_edges(size: int, directed: bool) -> int:
+    return size if directed else 2 * size
+
+
+def choose_variant(order: int, size: int, directed = False, max_out_degree: int | None = None,
+                   successor = False) -> str:
+    """returns the name of the graph variant with the best memory/latency trade-off for a graph's shape
+
+    a SuccessorGraph is only chosen when successor is True, since adding a second outgoing edge
+    to one of its vertices replaces the first instead of adding to it"""
+
+    if successor and directed and max_out_degree is not None and max_out_degree <= 1:
+        return "successor"
+    if order * order > matrix_limit:
+        return "list"
+    if order <= matrix_order or _stored_edges(size, directed) >= matrix_density * order * order:
+        return "matrix"
+    return "list"
+
+
+def max_out_degree(graph: Graph | SuccessorGraph) -> int:
+    """returns the largest out-degree of any vertex (0 for an empty graph)"""
+
+    if isinstance(graph, SuccessorGraph):
+        return int(graph.size > 0)
+    return max((graph.out_degree(v) for v in range(graph.order)), default = 0)
+
+
+def recommend(graph: Graph | SuccessorGraph, successor = False) -> str:
+    """returns the name of the best variant for an existing graph, based on its observed density and out-degree"""
+
+    directed = True if isinstance(graph, SuccessorGraph) else graph.directed
+    degree = max_out_degree(graph) if successor and directed else None
+    return choose_variant(graph.order, graph.size, directed, degree, successor)
+
+
+def optimize(graph: Graph | SuccessorGraph, successor = False, default_value: Any = None) -> Graph | SuccessorGraph:
+    """returns the graph converted to its recommended variant (or the graph itself if it already is)
+
+    NOTE: a converted graph is a new object, the original graph is left unchanged"""
+
+    variant = recommend(graph, successor)
+    if variant == "list":
+        return graph if isinstance(graph, ListGraph) else graph.to_list()
+    if variant == "matrix":
+        return graph if isinstance(graph, MatrixGraph) else graph.to_matrix(default_value)
+    return graph if isinstance(graph, SuccessorGraph) else graph.to_successor()
+
+
+def auto(v = 0, weighted = False, directed = False, expected_size: int | None = None, functional = False,
+         default_value: Any = None) -> Graph | SuccessorGraph:
+    """create a graph of the variant that suits the expected amount of edges
+
+    functional graphs (every vertex has at most one outgoing edge) become a SuccessorGraph.
+    without an expected_size, only small graphs become a MatrixGraph, and a graph without vertices
+    is always a ListGraph (a matrix grows quadratically when add_edge expands it)"""
+
+    if functional:
+        return SuccessorGraph(v, weighted)
+
+    if v == 0 and expected_size is None:
+        return ListGraph(v, weighted, directed)
+    if choose_variant(v, v if expected_size is None else expected_size, directed) == "matrix":
+        return MatrixGraph(v, weighted, directed, default_value)
+    return ListGraph(v, weighted, directed)
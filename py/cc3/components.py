@@ -0,0 +1,204 @@
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .graph import Graph, SuccessorGraph
+from .frozen import FrozenGraph, freeze, sorted_unique
+from .cycle import component_labels
+
+# below this many edges, worker processes cost more than they save
+parallel_threshold = 1 << 20
+
+
+# SHARED MEMORY
+class SharedArrays:
+    """copies numpy arrays into shared memory blocks so worker processes can map them without pickling
+
+    use as a context manager, the blocks are unlinked on exit"""
+
+    def __init__(self, **arrays: np.ndarray) -> None:
+        self.blocks = {}
+        self.specs = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create = True, size = max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer = block.buf)[...] = array
+            self.blocks[name] = block
+            self.specs[name] = (block.name, array.shape, array.dtype.str)
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+
+
+def _attach(specs: dict) -> tuple[dict, list]:
+    """helper function that maps shared arrays inside a worker process"""
+
+    arrays, blocks = {}, []
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name = block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer = block.buf)
+    return arrays, blocks
+
+
+def _detach(arrays: dict, blocks: list) -> None:
+    arrays.clear()
+    for block in blocks:
+        block.close()
+
+
+# WORKERS
+def _forest_worker(specs: dict, order: int, start: int, end: int) -> tuple[np.ndarray, np.ndarray, bool]:
+    """label the components of one partition of the edges
+
+    returns a spanning forest of the partition (at most order - 1 edges)
+    and whether the partition on its own already contains a cycle"""
+
+    arrays, blocks = _attach(specs)
+    try:
+        sources = np.array(arrays["sources"][start:end])
+        targets = np.array(arrays["targets"][start:end])
+    finally:
+        _detach(arrays, blocks)
+
+    return _forest(order, sources, targets)
+
+
+def _forest(order: int, sources: np.ndarray, targets: np.ndarray) -> tuple[np.ndarray, np.ndarray, bool]:
+    """helper function that reduces undirected edges to a spanning forest of the same components"""
+
+    labels = component_labels(order, sources, targets)
+    moved = np.flatnonzero(labels != np.arange(order))
+
+    # a forest has exactly (vertices - components) edges, anything more closes a cycle
+    cyclic = len(sources) > len(moved)
+    return moved, labels[moved], cyclic
+
+
+def _acyclic_worker(specs: dict, vertices: np.ndarray) -> bool:
+    """run Kahn's algorithm on the vertices of some weak components, returns whether they are acyclic"""
+
+    arrays, blocks = _attach(specs)
+    try:
+        return _acyclic(arrays["offsets"], arrays["targets"], vertices)
+    finally:
+        _detach(arrays, blocks)
+
+
+def _acyclic(offsets: np.ndarray, targets: np.ndarray, vertices: np.ndarray) -> bool:
+    """helper function that peels vertices without incoming edges from a union of weak components"""
+
+    graph = FrozenGraph(offsets, targets)
+    reached = graph.expand(vertices)
+    in_degree = np.bincount(reached, minlength = graph.order)
+
+    frontier = vertices[in_degree[vertices] == 0]
+    removed = 0
+    while len(frontier):
+        removed += len(frontier)
+        reached = graph.expand(frontier)
+        in_degree -= np.bincount(reached, minlength = graph.order)
+        candidates = sorted_unique(reached)
+        frontier = candidates[in_degree[candidates] == 0]
+
+    return removed == len(vertices)
+
+
+# COMPONENTS
+def _processes(processes: int | None) -> int:
+    return (os.cpu_count() or 1) if processes is None else max(int(processes), 1)
+
+
+def _undirected_edges(graph: FrozenGraph) -> tuple[np.ndarray, np.ndarray]:
+    """helper function that returns every edge once, ignoring direction"""
+
+    sources = graph.sources()
+    targets = np.asarray(graph.targets, dtype = np.int64)
+    if graph.directed:
+        return sources, targets
+
+    once = sources <= targets
+    return sources[once], targets[once]
+
+
+def _components(order: int, sources: np.ndarray, targets: np.ndarray, processes: int) -> tuple[np.ndarray, bool]:
+    """helper function that labels the components of undirected edges, splitting the edges over processes
+
+    returns the labels and whether any partition contained a cycle on its own"""
+
+    if processes <= 1 or len(sources) < parallel_threshold:
+        labels = component_labels(order, sources, targets)
+        return labels, len(sources) > order - len(sorted_unique(labels))
+
+    bounds = np.linspace(0, len(sources), processes + 1).astype(np.int64)
+    with SharedArrays(sources = sources, targets = targets) as shared, \
+            ProcessPoolExecutor(processes) as pool:
+        forests = list(pool.map(_forest_worker, [shared.specs] * processes, [order] * processes,
+                                bounds[:-1].tolist(), bounds[1:].tolist()))
+
+    # the union of the partition forests has the same components as the whole graph
+    forest_sources = np.concatenate([forest[0] for forest in forests])
+    forest_targets = np.concatenate([forest[1] for forest in forests])
+    labels = component_labels(order, forest_sources, forest_targets)
+    return labels, any(forest[2] for forest in forests)
+
+
+def connected_components(graph: Graph | SuccessorGraph | FrozenGraph, processes: int | None = 1) -> np.ndarray:
+    """returns a component label for every vertex (the smallest vertex of its component)
+
+    directed graphs are split into weakly connected components.
+    with processes > 1 (or None for every cpu) large graphs are partitioned by edges, each worker process
+    reduces its partition of the shared-memory edge arrays to a spanning forest and the forests are merged.
+    the result does not depend on the amount of processes"""
+
+    frozen = freeze(graph, weights = False)
+    sources, targets = _undirected_edges(frozen)
+    return _components(frozen.order, sources, targets, _processes(processes))[0]
+
+
+def component_count(graph: Graph | SuccessorGraph | FrozenGraph, processes: int | None = 1) -> int:
+    """returns the number of (weakly) connected components of a graph"""
+
+    return len(sorted_unique(connected_components(graph, processes)))
+
+
+# CYCLE DETECTION
+def has_cycle_parallel(graph: Graph | SuccessorGraph | FrozenGraph, processes: int | None = None) -> bool:
+    """returns a boolean indicating whether there is a cycle in a graph, using worker processes on large graphs
+
+    undirected graphs: components are labelled in parallel, there is a cycle iff edges > vertices - components.
+    directed graphs: the weak components are divided over the workers, which each run Kahn's algorithm"""
+
+    frozen = freeze(graph, weights = False)
+    processes = _processes(processes)
+    sources, targets = _undirected_edges(frozen)
+
+    if np.any(sources == targets):
+        return True
+
+    if not frozen.directed:
+        labels, cyclic = _components(frozen.order, sources, targets, processes)
+        return cyclic or len(sources) > frozen.order - len(sorted_unique(labels))
+
+    offsets = np.asarray(frozen.offsets, dtype = np.int64)
+    csr_targets = np.asarray(frozen.targets, dtype = np.int64)
+    if processes <= 1 or len(csr_targets) < parallel_threshold:
+        return not _acyclic(offsets, csr_targets, np.arange(frozen.order, dtype = np.int64))
+
+    # deal whole weak components to the workers, so no edge crosses between workers
+    labels = _components(frozen.order, sources, targets, processes)[0]
+    roots = sorted_unique(labels)
+    owner = np.zeros(frozen.order, dtype = np.int64)
+    owner[roots] = np.arange(len(roots)) % processes
+    owner = owner[labels]
+    groups = [np.flatnonzero(owner == worker) for worker in range(processes)]
+
+    with SharedArrays(offsets = offsets, targets = csr_targets) as shared, \
+            ProcessPoolExecutor(processes) as pool:
+        return not all(pool.map(_acyclic_worker, [shared.specs] * processes, groups))
@@ -1,10 +1,17 @@
+import numpy as np
 from .graph import Graph, ListGraph, MatrixGraph, SuccessorGraph
+from .frozen import FrozenGraph, scalar_frontier, scalar_view, sorted_unique
+from .view import SubgraphView
 
 
 # CYCLE DETECTION
-def has_cycle(graph: Graph | SuccessorGraph) -> bool:
+def has_cycle(graph: Graph | SuccessorGraph | FrozenGraph | SubgraphView) -> bool:
     """returns a boolean indicating whether there is a cycle in a graph"""
 
+    if isinstance(graph, FrozenGraph):
+        return has_cycle_frozen(graph)
+    if isinstance(graph, SubgraphView):
+        return has_cycle_view(graph)
     if isinstance(graph, SuccessorGraph):
         return has_cycle_successor(graph)
     if graph.directed:
@@ -16,7 +23,12 @@ def has_cycle(graph: Graph | SuccessorGraph) -> bool:
 def has_cycle_undirected(graph: Graph) -> bool:
     """returns a boolean indicating whether there is a cycle in an undirected graph"""
 
-    visited = [False] * graph.order
+    return _has_cycle_undirected_search(graph, [False] * graph.order)
+
+
+def _has_cycle_undirected_search(graph: Graph, visited: list[bool]) -> bool:
+    """helper function of has_cycle_undirected that searches from every unvisited vertex"""
+
     function = _has_cycle_undirected_list if isinstance(graph, ListGraph) else _has_cycle_undirected_matrix
 
     for n in range(len(visited)):
@@ -53,7 +65,12 @@ def _has_cycle_undirected_matrix(graph: MatrixGraph, current: int, parent: int,
 def has_cycle_directed(graph: Graph):
     """returns a boolean indicating whether there is a cycle in a directed graph"""
 
-    visited = [0] * graph.order
+    return _has_cycle_directed_search(graph, [0] * graph.order)
+
+
+def _has_cycle_directed_search(graph: Graph, visited: list[int]) -> bool:
+    """helper function of has_cycle_directed that searches from every unvisited vertex"""
+
     function = _has_cycle_directed_list if isinstance(graph, ListGraph) else _has_cycle_directed_matrix
 
     for n in range(graph.order):
@@ -92,7 +109,11 @@ def _has_cycle_directed_matrix(graph: MatrixGraph, current: int, visited: list[i
 def has_cycle_successor(graph: SuccessorGraph) -> bool:
     """returns a boolean indicating whether there is a cycle in a successor graph"""
 
-    visited = [0] * graph.order
+    return _has_cycle_successor_search(graph, [0] * graph.order)
+
+
+def _has_cycle_successor_search(graph: SuccessorGraph, visited: list[int]) -> bool:
+    """helper function of has_cycle_successor that searches from every unvisited vertex"""
 
     for n in range(graph.order):
         if not visited[n] and _has_cycle_successor_dfs(graph, n, visited):
@@ -111,4 +132,131 @@ def _has_cycle_successor_dfs(graph: SuccessorGraph, current: int, visited: list[
             return True
 
     visited[current] = 2
-    return False
\ No newline at end of file
+    return False
+
+
+# FROZEN GRAPH
+def has_cycle_frozen(graph: FrozenGraph) -> bool:
+    """returns a boolean indicating whether there is a cycle in a frozen graph"""
+
+    sources = graph.sources()
+    targets = np.asarray(graph.targets, dtype = np.int64)
+
+    if np.any(sources == targets):
+        return True
+    if graph.directed:
+        return _has_cycle_frozen_directed(graph, targets)
+
+    # an undirected forest has exactly (order - components) edges
+    return len(targets) // 2 > graph.order - len(sorted_unique(component_labels(graph.order, sources, targets)))
+
+
+def _has_cycle_frozen_directed(graph: FrozenGraph, targets: np.ndarray) -> bool:
+    """helper function of has_cycle_frozen that peels off vertices without incoming edges (Kahn's algorithm)
+
+    small frontiers are peeled with a scalar loop over the csr arrays, large ones in one vectorized step"""
+
+    in_degree = np.bincount(targets, minlength = graph.order)
+    frontier = np.flatnonzero(in_degree == 0)
+    frontier = frontier.tolist() if len(frontier) < scalar_frontier else frontier
+    removed = 0
+
+    offsets, destinations, degrees = scalar_view(graph.offsets), scalar_view(targets), scalar_view(in_degree)
+
+    while len(frontier):
+        removed += len(frontier)
+        if len(frontier) < scalar_frontier:
+            candidates = []
+            for v in frontier:
+                for w in destinations[offsets[v]:offsets[v + 1]]:
+                    degrees[w] -= 1
+                    if degrees[w] == 0:
+                        candidates.append(w)
+            frontier = candidates
+        else:
+            reached = graph.expand(np.asarray(frontier, dtype = np.int64))
+            in_degree -= np.bincount(reached, minlength = graph.order)
+            candidates = sorted_unique(reached)
+            frontier = candidates[in_degree[candidates] == 0]
+            frontier = frontier.tolist() if len(frontier) < scalar_frontier else frontier
+
+    return removed < graph.order
+
+
+# SUBGRAPH VIEW
+def has_cycle_view(graph: SubgraphView) -> bool:
+    """returns a boolean indicating whether there is a cycle in the visible part of a subgraph view"""
+
+    if not graph.directed:
+        return _has_cycle_view_undirected(graph, [False] * graph.order)
+    return _has_cycle_view_directed(graph, [0] * graph.order)
+
+
+def _has_cycle_view_directed(graph: SubgraphView, visited: list[int]) -> bool:
+    """helper function of has_cycle_view, an iterative version of the three-colour dfs of has_cycle_directed"""
+
+    for root in range(graph.order):
+        if visited[root] or not graph.mask[root]:
+            continue
+
+        visited[root] = 1
+        work = [(root, iter(graph.neighbours(root)))]
+        while work:
+            current, neighbours = work[-1]
+            for i in neighbours:
+                if visited[i] == 1:
+                    return True
+                if not visited[i]:
+                    visited[i] = 1
+                    work.append((i, iter(graph.neighbours(i))))
+                    break
+            else:
+                visited[current] = 2
+                work.pop()
+    return False
+
+
+def _has_cycle_view_undirected(graph: SubgraphView, visited: list[bool]) -> bool:
+    """helper function of has_cycle_view that merges the ends of every edge (union-find),
+    an edge between two already connected vertices closes a cycle"""
+
+    parent = list(range(graph.order))
+    mask = graph.mask
+
+    def find(v: int) -> int:
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    for v in range(graph.order):
+        if not mask[v]:
+            continue
+        visited[v] = True
+        for i in set(graph.neighbours(v)):
+            if i < v:
+                continue
+            if i == v:
+                return True
+            a, b = find(v), find(i)
+            if a == b:
+                return True
+            parent[b] = a
+    return False
+
+
+def component_labels(order: int, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """returns a label for each vertex such that two vertices share a label iff they are weakly connected
+
+    uses min-label propagation with pointer jumping, every label is the smallest vertex of its component"""
+
+    labels = np.arange(order, dtype = np.int64)
+    while True:
+        previous = labels.copy()
+        low = np.minimum(labels[sources], labels[targets])
+        np.minimum.at(labels, sources, low)
+        np.minimum.at(labels, targets, low)
+        np.minimum.at(labels, previous, labels)
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
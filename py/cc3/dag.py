@@ -0,0 +1,188 @@
+from __future__ import annotations
+import weakref
+from collections.abc import Sequence
+
+from .graph import Graph, Edge, ListGraph, MatrixGraph, SuccessorGraph
+from .frozen import FrozenGraph
+
+
+def successors(graph: Graph | SuccessorGraph | FrozenGraph) -> list[list[int]]:
+    """returns the destinations of every vertex's outgoing edges as plain lists"""
+
+    if isinstance(graph, ListGraph):
+        return [[e.dest for e in n] for n in graph.adj]
+    if isinstance(graph, MatrixGraph):
+        return [[i for i, e in enumerate(n) if e != graph.default_value] for n in graph.adj]
+    if isinstance(graph, SuccessorGraph):
+        return [[] if e is None else [e.dest] for e in graph.adj]
+    if isinstance(graph, FrozenGraph):
+        targets = graph.targets.tolist()
+        offsets = graph.offsets.tolist()
+        return [targets[offsets[v]:offsets[v + 1]] for v in range(graph.order)]
+
+    raise NotImplementedError(f"successors not supported for '{type(graph).__name__}'")
+
+
+# STRONGLY CONNECTED COMPONENTS
+def strongly_connected_components(graph: Graph | SuccessorGraph | FrozenGraph) -> list[list[int]]:
+    """returns the strongly connected components of a graph in topological order
+    (every edge between two components goes from an earlier to a later component)
+
+    uses an iterative version of Tarjan's algorithm, so deep graphs do not hit the recursion limit"""
+
+    return condensation(graph).components
+
+
+def _tarjan(adj: Sequence[Sequence[int]]) -> list[list[int]]:
+    """helper function that returns the strongly connected components in reverse topological order"""
+
+    order = len(adj)
+    index = [-1] * order
+    low = [0] * order
+    on_stack = [False] * order
+    stack = []
+    components = []
+    counter = 0
+
+    for root in range(order):
+        if index[root] != -1:
+            continue
+
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+
+        while work:
+            v, i = work[-1]
+            neighbours = adj[v]
+
+            # advance through the neighbours of v until one is unvisited
+            while i < len(neighbours):
+                w = neighbours[i]
+                i += 1
+                if index[w] == -1:
+                    break
+                if on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                # every neighbour is done, v is finished
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+                continue
+
+            work[-1] = (v, i)
+            index[w] = low[w] = counter
+            counter += 1
+            stack.append(w)
+            on_stack[w] = True
+            work.append((w, 0))
+
+    return components
+
+
+# CONDENSATION
+class Condensation:
+    """the strongly connected components of a graph and the directed acyclic graph between them
+
+    components are numbered in topological order, component[v] is the component of vertex (v)
+    and dag is a directed ListGraph with one vertex per component"""
+
+    def __init__(self, graph: Graph | SuccessorGraph | FrozenGraph) -> None:
+        adj = successors(graph)
+        self.components = _tarjan(adj)[::-1]
+
+        self.component = [0] * len(adj)
+        for c, members in enumerate(self.components):
+            for v in members:
+                self.component[v] = c
+
+        self.dag = ListGraph(len(self.components), directed = True)
+        self.loops = [False] * len(self.components)
+        seen = set()
+        for v, neighbours in enumerate(adj):
+            a = self.component[v]
+            for w in neighbours:
+                b = self.component[w]
+                if a == b:
+                    if v == w:
+                        self.loops[a] = True
+                elif (a, b) not in seen:
+                    seen.add((a, b))
+                    self.dag.adj[a].append(Edge(a, b, 1, self.dag))
+                    self.dag.size += 1
+
+    def is_acyclic(self) -> bool:
+        """returns whether the original graph has no directed cycle"""
+
+        return all(len(members) == 1 for members in self.components) and not any(self.loops)
+
+    def on_cycle(self, v: int) -> bool:
+        """returns whether vertex (v) lies on a directed cycle"""
+
+        c = self.component[v]
+        return len(self.components[c]) > 1 or self.loops[c]
+
+    def topological_order(self) -> list[int]:
+        """returns the vertices of an acyclic graph so that every edge points forward"""
+
+        if not self.is_acyclic():
+            raise ValueError("graph has a cycle, it has no topological order")
+        return [members[0] for members in self.components]
+
+    def reaches(self, a: int, b: int) -> bool:
+        """returns whether vertex (b) can be reached from vertex (a)"""
+
+        source, target = self.component[a], self.component[b]
+        if source > target:
+            return False
+
+        seen = {source}
+        stack = [source]
+        while stack:
+            c = stack.pop()
+            if c == target:
+                return True
+            for e in self.dag.adj[c]:
+                # components after the target cannot lead back to it
+                if e.dest not in seen and e.dest <= target:
+                    seen.add(e.dest)
+                    stack.append(e.dest)
+        return False
+
+
+_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def condensation(graph: Graph | SuccessorGraph | FrozenGraph) -> Condensation:
+    """returns the condensation of a graph, cached until the graph is mutated"""
+
+    cached = _cache.get(graph)
+    if cached is not None and cached[0] == graph.version:
+        return cached[1]
+
+    result = Condensation(graph)
+    _cache[graph] = (graph.version, result)
+    return result
+
+
+def topological_sort(graph: Graph | SuccessorGraph | FrozenGraph) -> list[int]:
+    """returns the vertices of a directed acyclic graph so that every edge points forward
+
+    raises a ValueError if the graph has a cycle"""
+
+    return condensation(graph).topological_order()
@@ -0,0 +1,175 @@
+import heapq
+from collections import deque
+from collections.abc import Sequence
+from typing import Any
+
+from .graph import Graph, ListGraph, MatrixGraph, SuccessorGraph
+from .traversal import bfs
+
+
+def _outgoing(graph: Graph | SuccessorGraph, v: int) -> list[int]:
+    """helper function that returns the destinations of the outgoing edges of a vertex"""
+
+    if isinstance(graph, ListGraph):
+        return [e.dest for e in graph.adj[v]]
+    if isinstance(graph, MatrixGraph):
+        return graph.get_outgoing(v)
+    e = graph.adj[v]
+    return [] if e is None else [e.dest]
+
+
+class DistanceTracker:
+    """keeps the bfs distances from a few anchor vertices up to date while edges are added and removed
+
+    mutate the graph through the tracker (add_edge, remove_edge), which updates the graph and then
+    repairs only the vertices whose distance changes: an insertion relaxes outwards from the new edge,
+    a deletion finds the vertices that lost every shortest-path parent and recomputes just those.
+    dist[anchor] is the distance list of an anchor, with the same meaning as the result of bfs.
+    if the graph is mutated directly, the distances are recomputed on the next access"""
+
+    def __init__(self, graph: Graph | SuccessorGraph, anchors: int | Sequence[int] = 0) -> None:
+        if not isinstance(graph, (ListGraph, MatrixGraph, SuccessorGraph)):
+            raise NotImplementedError(f"distance tracking not supported for '{type(graph).__name__}'")
+
+        self.graph = graph
+        self.anchors = [anchors] if isinstance(anchors, int) else list(anchors)
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """recompute every distance and the incoming edges from scratch"""
+
+        graph = self.graph
+        self.directed = True if isinstance(graph, SuccessorGraph) else graph.directed
+        self.dist = {anchor: list(bfs(graph, anchor)) for anchor in self.anchors}
+
+        # the tracker keeps its own incoming sets, graphs only scan for incoming edges in O(edges)
+        self.incoming: list[set[int]] = [set() for _ in range(graph.order)]
+        for v in range(graph.order):
+            for w in _outgoing(graph, v):
+                self.incoming[w].add(v)
+        self.version = graph.version
+
+    def _sync(self) -> None:
+        if self.graph.version != self.version:
+            self.rebuild()
+
+    def distance(self, anchor: int, v: int) -> int:
+        """returns the distance from an anchor to vertex (v) (-1 if it cannot be reached)"""
+
+        self._sync()
+        return self.dist[anchor][v]
+
+    def distances(self, anchor: int) -> list[int]:
+        """returns the distance list of an anchor"""
+
+        self._sync()
+        return self.dist[anchor]
+
+    # EDGE CONTROL
+    def add_edge(self, a: int, b: int, w: Any = 1, auto_expand = True) -> None:
+        """insert an edge into the graph and update the distances"""
+
+        self._sync()
+        graph = self.graph
+        if isinstance(graph, SuccessorGraph) and 0 <= a < graph.order and graph.adj[a] is not None \
+                and graph.adj[a].dest != b:
+            # a successor graph replaces the outgoing edge of (a)
+            self.remove_edge(a, graph.adj[a].dest)
+
+        graph.add_edge(a, b, w, auto_expand)
+        self._grow()
+
+        self.incoming[b].add(a)
+        if not self.directed:
+            self.incoming[a].add(b)
+
+        for anchor in self.anchors:
+            dist = self.dist[anchor]
+            self._insert(dist, a, b)
+            if not self.directed:
+                self._insert(dist, b, a)
+        self.version = graph.version
+
+    def remove_edge(self, a: int, b: int) -> None:
+        """remove an edge from the graph and update the distances"""
+
+        self._sync()
+        self.graph.remove_edge(a, b)
+
+        self.incoming[b].discard(a)
+        if not self.directed:
+            self.incoming[a].discard(b)
+
+        for anchor in self.anchors:
+            dist = self.dist[anchor]
+            self._delete(anchor, dist, a, b)
+            if not self.directed:
+                self._delete(anchor, dist, b, a)
+        self.version = self.graph.version
+
+    def _grow(self) -> None:
+        """helper function that extends the tracker after add_edge added vertices"""
+
+        missing = self.graph.order - len(self.incoming)
+        if missing > 0:
+            self.incoming.extend(set() for _ in range(missing))
+            for dist in self.dist.values():
+                dist.extend([-1] * missing)
+
+    # REPAIR
+    def _insert(self, dist: list[int], a: int, b: int) -> None:
+        """helper function that relaxes the distances reachable through a new edge [a->b]"""
+
+        if dist[a] == -1 or (dist[b] != -1 and dist[b] <= dist[a] + 1):
+            return
+
+        dist[b] = dist[a] + 1
+        queue = deque([b])
+        while queue:
+            current = queue.popleft()
+            for i in _outgoing(self.graph, current):
+                if dist[i] == -1 or dist[i] > dist[current] + 1:
+                    dist[i] = dist[current] + 1
+                    queue.append(i)
+
+    def _delete(self, anchor: int, dist: list[int], a: int, b: int) -> None:
+        """helper function that repairs the distances after the edge [a->b] was removed"""
+
+        if b == anchor or dist[a] == -1 or dist[b] != dist[a] + 1 or self._supported(dist, b, set()):
+            return
+
+        # collect the vertices that lost every parent on a shortest path, level by level
+        affected = {b}
+        queue = deque([b])
+        while queue:
+            current = queue.popleft()
+            for i in _outgoing(self.graph, current):
+                if i not in affected and i != anchor and dist[i] == dist[current] + 1 \
+                        and not self._supported(dist, i, affected):
+                    affected.add(i)
+                    queue.append(i)
+
+        # recompute the affected vertices from their unaffected neighbours (dijkstra with unit weights)
+        heap = []
+        for v in affected:
+            dist[v] = -1
+        for v in affected:
+            best = min((dist[p] for p in self.incoming[v] if p not in affected and dist[p] != -1), default = -1)
+            if best != -1:
+                heap.append((best + 1, v))
+        heapq.heapify(heap)
+
+        while heap:
+            d, v = heapq.heappop(heap)
+            if dist[v] != -1 and dist[v] <= d:
+                continue
+            dist[v] = d
+            for i in _outgoing(self.graph, v):
+                if i in affected and (dist[i] == -1 or dist[i] > d + 1):
+                    heapq.heappush(heap, (d + 1, i))
+
+    def _supported(self, dist: list[int], v: int, affected: set[int]) -> bool:
+        """helper function that returns whether vertex (v) still has an unaffected parent one level closer"""
+
+        level = dist[v] - 1
+        return any(dist[p] == level and p not in affected for p in self.incoming[v])
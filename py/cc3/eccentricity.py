@@ -0,0 +1,286 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+import numpy as np
+
+from .graph import Graph, SuccessorGraph
+from .frozen import FrozenGraph, freeze, from_edges
+from .traversal import bfs
+from .components import SharedArrays, _attach, _detach, _processes, connected_components
+from .dag import condensation
+
+# ECCENTRICITY
+# the eccentricity of a vertex is the largest distance from it to any vertex it can reach,
+# the diameter is the largest eccentricity (unreachable pairs are ignored)
+
+# sources per bfs batch, the time budget is checked (and worker processes are fed) once per batch
+batch_size = 32
+
+
+def _farthest(graph: FrozenGraph, sources: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """helper function that runs bfs from every source
+
+    returns the eccentricity of every source and, for every vertex, its largest distance from any source"""
+
+    eccentricity = np.zeros(len(sources), dtype = np.int64)
+    farthest = np.full(graph.order, -1, dtype = np.int64)
+    for i, s in enumerate(sources.tolist()):
+        dist = bfs(graph, s)
+        eccentricity[i] = dist.max()
+        np.maximum(farthest, dist, out = farthest)
+    return eccentricity, farthest
+
+
+def _farthest_worker(specs: dict, sources: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """run bfs from a batch of sources over the shared-memory edge arrays, see _farthest"""
+
+    arrays, blocks = _attach(specs)
+    try:
+        return _farthest(FrozenGraph(arrays["offsets"], arrays["targets"]), sources)
+    finally:
+        _detach(arrays, blocks)
+
+
+def _sweep(graph: FrozenGraph, sources: np.ndarray, processes: int,
+           deadline: float | None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """helper function that runs bfs from the sources in batches until they are done or the deadline passes
+
+    returns the sources that were processed, their eccentricities and the largest distance
+    from any processed source to every vertex"""
+
+    batches = [sources[i:i + batch_size] for i in range(0, len(sources), batch_size)]
+    results = []
+
+    if processes <= 1 or len(batches) <= 1:
+        for batch in batches:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            results.append((batch, *_farthest(graph, batch)))
+    else:
+        offsets = np.asarray(graph.offsets, dtype = np.int64)
+        targets = np.asarray(graph.targets, dtype = np.int64)
+        with SharedArrays(offsets = offsets, targets = targets) as shared:
+            pool = ProcessPoolExecutor(processes)
+            futures = {pool.submit(_farthest_worker, shared.specs, batch): batch for batch in batches}
+            wait(futures, timeout = None if deadline is None else max(deadline - time.perf_counter(), 0))
+            # batches that have not started are dropped, running ones are allowed to finish
+            pool.shutdown(wait = True, cancel_futures = True)
+            for future, batch in futures.items():
+                if future.done() and not future.cancelled():
+                    results.append((batch, *future.result()))
+
+    farthest = np.full(graph.order, -1, dtype = np.int64)
+    for result in results:
+        np.maximum(farthest, result[2], out = farthest)
+    if not results:
+        return np.zeros(0, dtype = np.int64), np.zeros(0, dtype = np.int64), farthest
+    return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results]), farthest
+
+
+def _frozen(graph: Graph | SuccessorGraph | FrozenGraph) -> FrozenGraph:
+    return graph if isinstance(graph, FrozenGraph) else freeze(graph, weights = False)
+
+
+def _deadline(budget: float | None) -> float | None:
+    return None if budget is None else time.perf_counter() + budget
+
+
+# DIAMETER
+def _ifub(graph: FrozenGraph, members: np.ndarray, processes: int, deadline: float | None) -> tuple[int, int]:
+    """helper function that returns lower and upper bounds of the diameter of one connected component
+    of an undirected graph (equal unless the deadline passed), using iFUB:
+
+    a double sweep finds a long shortest path (a lower bound) and a central vertex u. the vertices at
+    distance i from u all have eccentricity <= 2i, so going through the bfs levels of u from the
+    outside in, once the largest eccentricity found exceeds 2(i - 1), no closer vertex can beat it"""
+
+    degree = np.diff(np.asarray(graph.offsets, dtype = np.int64))
+    start = int(members[np.argmax(degree[members])])
+
+    dist_start = bfs(graph, start)
+    dist_a = bfs(graph, int(np.argmax(dist_start)))
+    length = int(dist_a.max())
+    dist_b = bfs(graph, int(np.argmax(dist_a)))
+    middle = int(np.flatnonzero((dist_a == length // 2) & (dist_a + dist_b == length))[0])
+    dist_middle = bfs(graph, middle)
+
+    # the levels further than lower / 2 from u are searched, so u is whichever of the middle vertex
+    # and the highest degree vertex has fewer vertices out there
+    lower = max(length, int(dist_start.max()), int(dist_middle.max()))
+    dist_u = min(dist_middle, dist_start, key = lambda dist: np.count_nonzero(2 * dist > lower))
+    i = int(dist_u.max())
+    upper = 2 * i
+
+    while upper > lower:
+        fringe = np.flatnonzero(dist_u == i)
+        done, eccentricity, _ = _sweep(graph, fringe, processes, deadline)
+        if len(eccentricity):
+            lower = max(lower, int(eccentricity.max()))
+        if len(done) < len(fringe):
+            return lower, upper
+        if lower > 2 * (i - 1):
+            break
+        upper = 2 * (i - 1)
+        i -= 1
+
+    return lower, lower
+
+
+def _tighten(upper: np.ndarray, component: np.ndarray, sizes: list[int], dag: list[list[int]]) -> np.ndarray:
+    """helper function that tightens the eccentricity bounds of the vertices of a directed graph
+    through its strongly connected components
+
+    a shortest path takes at most |C| - 1 steps inside a component C before it leaves it for a successor
+    component D, so bound(C) = max(|C| - 1, |C| + max bound(D)), built in reverse topological order.
+    no vertex of C can exceed the largest bound of its members either, so the smaller value is kept"""
+
+    limits = np.zeros(len(sizes), dtype = np.int64)
+    np.maximum.at(limits, component, upper)
+    bounds = limits.tolist()
+    for c in range(len(sizes) - 1, -1, -1):
+        bound = sizes[c] - 1
+        for d in dag[c]:
+            bound = max(bound, sizes[c] + bounds[d])
+        bounds[c] = min(bounds[c], bound)
+    return np.minimum(upper, np.array(bounds, dtype = np.int64)[component])
+
+
+def _directed_bounds(graph: Graph | SuccessorGraph | FrozenGraph, frozen: FrozenGraph, processes: int,
+                     deadline: float | None) -> tuple[int, int]:
+    """helper function that returns lower and upper bounds of the diameter of a directed graph
+    (equal unless the deadline passed)
+
+    every vertex has an upper bound of its eccentricity, from the strongly connected components (see _tighten).
+    the vertices of a strongly connected component all reach the same vertices, so a bfs from s also
+    bounds ecc(v) <= d(v, s) + ecc(s) for every v in the component of s (d(v, s) from a backward bfs).
+    one vertex of every strongly connected component (largest first) is searched before the others, the
+    rest are taken by decreasing bound, until no remaining vertex can beat the largest eccentricity found.
+    the first batches are small, since a single bfs often prunes most of the graph"""
+
+    result = condensation(graph)
+    component = np.array(result.component, dtype = np.int64)
+    sizes = [len(members) for members in result.components]
+    dag = [[e.dest for e in edges] for edges in result.dag.adj]
+
+    upper = _tighten(np.full(frozen.order, frozen.order - 1, dtype = np.int64), component, sizes, dag)
+    remaining = np.ones(frozen.order, dtype = bool)
+    component_size = np.array(sizes, dtype = np.int64)
+    explored = component_size == 1
+    backward = None
+    lower = processed = 0
+
+    while True:
+        candidates = np.flatnonzero(remaining & (upper > lower))
+        if not len(candidates):
+            return lower, lower
+
+        count = min(len(candidates), max(processed, 1), batch_size * processes)
+        fresh = candidates[~explored[component[candidates]]]
+        if len(fresh):
+            fresh = fresh[np.unique(component[fresh], return_index = True)[1]]
+            sources = fresh[np.argsort(-component_size[component[fresh]], kind = "stable")[:count]]
+        else:
+            sources = candidates[np.argpartition(-upper[candidates], count - 1)[:count]]
+        done, eccentricity, _ = _sweep(frozen, sources, processes, deadline)
+        remaining[done] = False
+        explored[component[done]] = True
+        upper[done] = eccentricity
+        processed += len(done)
+        if len(eccentricity):
+            lower = max(lower, int(eccentricity.max()))
+        if len(done) < len(sources):
+            upper = _tighten(upper, component, sizes, dag)
+            return lower, max(lower, int(upper[remaining].max(initial = 0)))
+
+        for s, e in zip(done.tolist(), eccentricity.tolist()):
+            if sizes[component[s]] > 1:
+                if backward is None:
+                    backward = from_edges(frozen.order, frozen.targets, frozen.sources(), directed = True)
+                members = np.flatnonzero(component == component[s])
+                upper[members] = np.minimum(upper[members], bfs(backward, s)[members] + e)
+        if np.any(remaining & (upper > lower)):
+            upper = _tighten(upper, component, sizes, dag)
+
+
+def diameter_bounds(graph: Graph | SuccessorGraph | FrozenGraph, budget: float | None = None,
+                    processes: int | None = 1) -> tuple[int, int]:
+    """returns a lower and an upper bound of the diameter of a graph, which are equal if it is exact
+
+    undirected graphs use iFUB on every connected component (large components first, components too
+    small to beat the current diameter are skipped), which usually needs only a few bfs runs.
+    directed graphs run bfs from the vertices whose eccentricity bound (from the strongly connected
+    components, see _directed_bounds) can still beat the largest eccentricity found. this prunes most
+    vertices of graphs with small strongly connected components, but a graph that is one strongly
+    connected component may need a bfs from most of its vertices.
+    budget is a time limit in seconds, once it is exceeded the bounds found so far are returned.
+    with processes > 1 (or None for every cpu), batches of bfs runs are spread over worker processes"""
+
+    frozen = _frozen(graph)
+    deadline = _deadline(budget)
+    processes = _processes(processes)
+    if frozen.order == 0:
+        return 0, 0
+
+    if frozen.directed:
+        return _directed_bounds(graph, frozen, processes, deadline)
+
+    # group the vertices by component, largest component first
+    labels = connected_components(frozen)
+    by_label = np.argsort(labels, kind = "stable")
+    heads = np.flatnonzero(np.concatenate([[True], labels[by_label][1:] != labels[by_label][:-1]]))
+    groups = sorted(np.split(by_label, heads[1:]), key = len, reverse = True)
+
+    lower = upper = 0
+    for members in groups:
+        if len(members) - 1 <= lower:
+            break
+        if deadline is not None and time.perf_counter() > deadline:
+            # a component of k vertices has a diameter of at most k - 1
+            upper = max(upper, len(members) - 1)
+            break
+        low, high = _ifub(frozen, members, processes, deadline)
+        lower, upper = max(lower, low), max(upper, high)
+
+    return lower, max(lower, upper)
+
+
+def diameter(graph: Graph | SuccessorGraph | FrozenGraph, processes: int | None = 1) -> int:
+    """returns the exact diameter of a graph, see diameter_bounds"""
+
+    return diameter_bounds(graph, None, processes)[0]
+
+
+# ECCENTRICITIES
+def eccentricities(graph: Graph | SuccessorGraph | FrozenGraph, samples: int | None = None, seed: int | None = None,
+                   budget: float | None = None, processes: int | None = 1) -> np.ndarray:
+    """returns the eccentricity of every vertex
+
+    without samples, bfs runs from every vertex and the result is exact.
+    with samples, bfs runs from that many random sources only and every vertex gets the lower bound
+    max(distance from the vertex to a sampled source) (exact for the sampled sources of undirected graphs).
+    directed graphs are searched backwards from the samples for this.
+    once the time budget (seconds) is exceeded, the remaining sources are skipped.
+    vertices that are not in reach of any processed source get -1"""
+
+    frozen = _frozen(graph)
+    deadline = _deadline(budget)
+    processes = _processes(processes)
+    order = frozen.order
+
+    if samples is None:
+        done, eccentricity, farthest = _sweep(frozen, np.arange(order, dtype = np.int64), processes, deadline)
+        result = farthest if not frozen.directed else np.full(order, -1, dtype = np.int64)
+        result[done] = eccentricity
+        return result
+
+    if not 0 < samples <= order:
+        raise ValueError("samples must be between 1 and the amount of vertices")
+    sources = np.random.default_rng(seed).choice(order, samples, replace = False).astype(np.int64)
+
+    if not frozen.directed:
+        done, eccentricity, farthest = _sweep(frozen, sources, processes, deadline)
+        farthest[done] = eccentricity
+        return farthest
+
+    backward = from_edges(order, frozen.targets, frozen.sources(), directed = True)
+    return _sweep(backward, sources, processes, deadline)[2]
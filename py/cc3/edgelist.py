@@ -0,0 +1,124 @@
+import numpy as np
+import gzip, re
+from collections.abc import Iterator
+from typing import Any
+
+from .graph import Graph, SuccessorGraph
+from .frozen import FrozenGraph, from_edges
+
+comment_pattern = re.compile(rb"#[^\n]*")
+
+# the bytes that separate values (the whitespace of bytes.split)
+separators = np.zeros(256, dtype = bool)
+separators[list(b" \t\n\r\v\f")] = True
+
+
+def _open(path: str, compression: str | None):
+    """helper function that opens a (possibly gzip compressed) file for binary reading"""
+
+    if compression == "auto":
+        compression = "gzip" if path.endswith(".gz") else None
+
+    if compression == "gzip":
+        return gzip.open(path, "rb")
+    if compression is None:
+        return open(path, "rb")
+    raise ValueError(f"unsupported compression '{compression}'")
+
+
+def _line_columns(data: bytes) -> np.ndarray:
+    """helper function that returns the amount of values on every line of a block (0 for blank lines)"""
+
+    chars = np.frombuffer(data, dtype = np.uint8)
+    separator = separators[chars]
+    starts = np.flatnonzero(~separator[1:] & separator[:-1]) + 1
+    if len(chars) and not separator[0]:
+        starts = np.concatenate([[0], starts])
+
+    newlines = np.flatnonzero(chars == ord("\n"))
+    line = np.searchsorted(newlines, starts)
+    return np.bincount(line, minlength = len(newlines) + (not data.endswith(b"\n")))
+
+
+def iter_edgelist(path: str, chunk_size = 1 << 24, compression: str | None = "auto") -> Iterator[np.ndarray]:
+    """parse a whitespace separated edge list ("src dst [weight]" per line, '#' starts a comment)
+
+    the file is read in blocks of about chunk_size bytes, each block is parsed in bulk by numpy
+    and yielded as a float64 array of shape (k, columns), so memory use does not grow with the file size"""
+
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    columns = None
+    remainder = b""
+    lines = 0
+
+    with _open(path, compression) as file:
+        while True:
+            block = file.read(chunk_size)
+            data = remainder + block
+
+            # only parse complete lines, the rest is carried over to the next block
+            cut = data.rfind(b"\n") + 1 if block else len(data)
+            data, remainder = data[:cut], data[cut:]
+
+            if b"#" in data:
+                data = comment_pattern.sub(b"", data)
+
+            if data.strip():
+                counts = _line_columns(data)
+                if columns is None:
+                    columns = int(counts[np.flatnonzero(counts)[0]])
+                    if columns not in (2, 3):
+                        raise ValueError(f"edge list lines must have 2 or 3 columns (found {columns})")
+
+                wrong = np.flatnonzero((counts != 0) & (counts != columns))
+                if len(wrong):
+                    raise ValueError(f"line {lines + wrong[0] + 1} of the edge list has {counts[wrong[0]]} columns "
+                                     f"(expected {columns})")
+
+                values = np.fromstring(data.decode("ascii"), dtype = np.float64, sep = " ")
+                if len(values) != counts.sum():
+                    raise ValueError("edge list values must be numbers")
+                yield values.reshape(-1, columns)
+
+            lines += data.count(b"\n")
+
+            if not block:
+                return
+
+
+def read_edgelist(path: str, variant = "list", directed = False, weighted: bool | None = None,
+                  order: int | None = None, chunk_size = 1 << 24, compression: str | None = "auto",
+                  default_value: Any = None) -> Graph | SuccessorGraph | FrozenGraph:
+    """read an edge list file into a graph (variant "list", "matrix", "successor" or "frozen")
+
+    edges are streamed chunk by chunk into compact integer arrays, then the graph is built in a single pass.
+    weighted defaults to whether the file has a third column, and order to the largest vertex id + 1
+
+    NOTE: vertex ids are used as they are, so they must be non-negative integers"""
+
+    sources, targets, weights = [], [], []
+    for chunk in iter_edgelist(path, chunk_size, compression):
+        sources.append(chunk[:, 0].astype(np.int64))
+        targets.append(chunk[:, 1].astype(np.int64))
+        if chunk.shape[1] == 3:
+            weights.append(chunk[:, 2])
+
+    sources = np.concatenate(sources) if sources else np.zeros(0, dtype = np.int64)
+    targets = np.concatenate(targets) if targets else np.zeros(0, dtype = np.int64)
+    weights = np.concatenate(weights) if weights else None
+    if weights is not None and np.all(weights == np.floor(weights)):
+        weights = weights.astype(np.int64)
+
+    if weighted is None:
+        weighted = weights is not None
+    if order is None:
+        order = int(max(sources.max(), targets.max())) + 1 if len(sources) else 0
+
+    frozen_variant = "list" if variant == "frozen" else variant
+    if frozen_variant not in ("list", "matrix", "successor"):
+        raise TypeError(f"no graph variant named '{variant}'")
+
+    frozen = from_edges(order, sources, targets, weights, frozen_variant, weighted, directed, default_value)
+    return frozen if variant == "frozen" else frozen.thaw()
@@ -0,0 +1,300 @@
+from __future__ import annotations
+import numpy as np
+from collections.abc import Sequence
+from typing import Any
+
+from .graph import Graph, Edge, ListGraph, MatrixGraph, SuccessorGraph
+
+
+# frontiers with fewer vertices than this are expanded one vertex at a time by the level-synchronous
+# kernels (bfs, has_cycle), since the fixed cost of a vectorized step dominates on small levels
+scalar_frontier = 128
+
+
+class FrozenGraph:
+    """a read-only graph variant that stores edges in compressed sparse rows (offsets + targets + weights)
+
+    the outgoing edges of vertex (v) are targets[offsets[v]:offsets[v + 1]], sorted by destination.
+    the arrays may be memory-mapped, so a FrozenGraph can be larger than the available memory.
+    undirected graphs store each edge in both directions, like ListGraph does (loops are stored once)
+
+    NOTE: use cc3.load or cc3.freeze to create a FrozenGraph"""
+
+    def __init__(self, offsets: np.ndarray, targets: np.ndarray, weights: np.ndarray | None = None,
+                 size: int | None = None, weighted = False, directed = False, variant = "list",
+                 default_value: Any = None) -> None:
+        if len(offsets) == 0:
+            raise ValueError("offsets must contain at least one element")
+
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+        self.order = len(offsets) - 1
+        self.size = len(targets) if size is None else size
+
+        self.weighted = weighted
+        self.directed = directed
+        self.variant = variant
+        self.default_value = default_value
+        self.version = 0  # never changes, a FrozenGraph is read-only
+
+    def __str__(self) -> str:
+        result = ""
+        for v in range(self.order):
+            result += str(v) + " | " + ' '.join(f"[{d}]" for d in self.get_outgoing(v).tolist()) + '\n'
+        return result.strip()
+
+    def get_data(self) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+        """returns the graph's raw offsets, targets and weights arrays"""
+
+        return self.offsets, self.targets, self.weights
+
+    def sources(self) -> np.ndarray:
+        """returns the origin of every stored edge (parallel to targets)"""
+
+        return np.repeat(np.arange(self.order, dtype = np.int64), np.diff(self.offsets))
+
+    def expand(self, frontier: np.ndarray) -> np.ndarray:
+        """returns the destinations of every edge leaving a set of vertices (in one vectorized step)"""
+
+        starts = np.asarray(self.offsets[frontier], dtype = np.int64)
+        counts = np.asarray(self.offsets[frontier + 1], dtype = np.int64) - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.zeros(0, dtype = np.int64)
+
+        index = np.arange(total, dtype = np.int64) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        return np.asarray(self.targets[index], dtype = np.int64)
+
+    # VERTEX ACCESS
+    def _check(self, v: int) -> None:
+        if not 0 <= v < self.order:
+            raise IndexError(f"vertex ({v}) does not exist in graph")
+
+    def get_outgoing(self, v: int) -> np.ndarray:
+        """returns the destinations of all outgoing edges of a vertex"""
+
+        self._check(v)
+        return self.targets[self.offsets[v]:self.offsets[v + 1]]
+
+    def get_incoming(self, v: int) -> np.ndarray:
+        """returns the origins of all incoming edges of a vertex"""
+
+        self._check(v)
+        return self.sources()[np.asarray(self.targets) == v]
+
+    def out_degree(self, v: int) -> int:
+        """returns the number of outgoing edges of a vertex"""
+
+        self._check(v)
+        return int(self.offsets[v + 1] - self.offsets[v])
+
+    def in_degree(self, v: int) -> int:
+        """returns the number of incoming edges of a vertex"""
+
+        self._check(v)
+        return int(np.count_nonzero(np.asarray(self.targets) == v))
+
+    def degree(self, v: int) -> int:
+        """returns the degree of a vertex"""
+
+        return int(self.directed) * self.in_degree(v) + self.out_degree(v)
+
+    # EDGE ACCESS
+    def _find(self, a: int, b: int) -> int:
+        """helper function that returns the index of the edge between (a) and (b), or -1"""
+
+        start, end = int(self.offsets[a]), int(self.offsets[a + 1])
+        i = start + int(np.searchsorted(self.targets[start:end], b))
+        if i < end and self.targets[i] == b:
+            return i
+        return -1
+
+    def is_edge(self, a: int, b: int) -> bool:
+        """returns a boolean indicating whether there is an edge between (a) and (b)"""
+
+        if not (0 <= a < self.order and 0 <= b < self.order):
+            return False
+        return self._find(a, b) != -1
+
+    def get_edge(self, a: int, b: int) -> Edge:
+        """returns a (detached) object representing the edge between (a) and (b)"""
+
+        return Edge(a, b, self.get_weight(a, b))
+
+    def get_weight(self, a: int, b: int) -> Any:
+        """returns the weight of an edge between (a) and (b)"""
+
+        self._check(a)
+        self._check(b)
+
+        i = self._find(a, b)
+        if i == -1:
+            raise IndexError(f"edge [{a}->{b}] not in graph")
+        return 1 if self.weights is None else self.weights[i].item()
+
+    # CONVERSION
+    def thaw(self) -> Graph | SuccessorGraph:
+        """returns a mutable copy of the graph in its original variant"""
+
+        sources = self.sources().tolist()
+        targets = np.asarray(self.targets).tolist()
+        weights = [1] * len(targets) if self.weights is None else np.asarray(self.weights).tolist()
+
+        if self.variant == "list":
+            graph = ListGraph(self.order, self.weighted, self.directed)
+            for a, b, w in zip(sources, targets, weights):
+                graph.adj[a].append(Edge(a, b, w, graph))
+                if a == b and not self.directed:
+                    # undirected loops are stored twice in a ListGraph
+                    graph.adj[a].append(Edge(a, b, w, graph))
+
+        elif self.variant == "matrix":
+            graph = MatrixGraph(self.order, self.weighted, self.directed, self.default_value)
+            for a, b, w in zip(sources, targets, weights):
+                graph.adj[a][b] = w
+
+        elif self.variant == "successor":
+            graph = SuccessorGraph(self.order, self.weighted)
+            for a, b, w in zip(sources, targets, weights):
+                graph.adj[a] = Edge(a, b, w, graph)
+
+        else:
+            raise TypeError(f"no graph variant named '{self.variant}'")
+
+        graph.size = self.size
+        return graph
+
+
+def freeze(graph: Graph | SuccessorGraph, weights = True) -> FrozenGraph:
+    """returns a FrozenGraph holding a snapshot of a graph's edges
+
+    if weights is False, only the topology is stored (an unweighted FrozenGraph), which also works
+    for graphs with non-numeric weights. meant for algorithms that ignore weights"""
+
+    if isinstance(graph, FrozenGraph):
+        return graph
+
+    sources, targets, values = [], [], []
+
+    if isinstance(graph, ListGraph):
+        for n in graph.adj:
+            for e in n:
+                sources.append(e.origin)
+                targets.append(e.dest)
+                values.append(e.weight)
+        variant, directed = "list", graph.directed
+
+    elif isinstance(graph, MatrixGraph):
+        for i, n in enumerate(graph.adj):
+            for j, w in enumerate(n):
+                if w != graph.default_value:
+                    sources.append(i)
+                    targets.append(j)
+                    values.append(w)
+        variant, directed = "matrix", graph.directed
+
+    elif isinstance(graph, SuccessorGraph):
+        for e in graph.adj:
+            if e is not None:
+                sources.append(e.origin)
+                targets.append(e.dest)
+                values.append(e.weight)
+        variant, directed = "successor", True
+
+    else:
+        raise NotImplementedError(f"freeze not supported for '{type(graph).__name__}'")
+
+    offsets, targets, values = build_csr(graph.order, sources, targets, values if weights else None, unique = True)
+    return FrozenGraph(offsets, targets, values, graph.size, graph.weighted and weights, directed, variant,
+                       getattr(graph, "default_value", None))
+
+
+def sorted_unique(values: np.ndarray) -> np.ndarray:
+    """returns the sorted distinct values of an integer array (faster than np.unique on large arrays)"""
+
+    values = np.sort(values)
+    if len(values) < 2:
+        return values
+    keep = np.ones(len(values), dtype = bool)
+    keep[1:] = values[1:] != values[:-1]
+    return values[keep]
+
+
+def scalar_view(values: np.ndarray) -> memoryview:
+    """returns a memoryview of an array for fast scalar access (no copy unless it is in non-native byte order)"""
+
+    native = values.dtype.newbyteorder('=')
+    return memoryview(values.view(native) if values.dtype.isnative else values.astype(native))
+
+
+def build_csr(order: int, sources: Sequence[int], targets: Sequence[int], weights: Sequence[Any] | None = None,
+              unique = False) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+    """helper function that sorts edge arrays into compressed sparse rows
+
+    if unique is True, only the last of several edges between the same endpoints is kept.
+    weights are dropped if they are all equal to 1, and stored as int64 if they are all integers"""
+
+    sources = np.asarray(sources, dtype = np.int64)
+    targets = np.asarray(targets, dtype = np.int64)
+
+    # a single stable sort on the combined (source, target) key keeps the insertion order of duplicates
+    key = sources * max(order, 1) + targets
+    order_by = np.argsort(key, kind = "stable")
+    if unique and len(order_by):
+        keep = np.ones(len(order_by), dtype = bool)
+        keep[:-1] = np.diff(key[order_by]) != 0
+        order_by = order_by[keep]
+
+    offsets = np.zeros(order + 1, dtype = np.int64)
+    np.cumsum(np.bincount(sources[order_by], minlength = order), out = offsets[1:])
+
+    if weights is not None:
+        weights = np.asarray(weights)
+        if weights.dtype == object or weights.dtype.kind not in "biuf":
+            raise TypeError("only numeric edge weights can be stored in a FrozenGraph")
+        weights = weights.astype(np.int64 if weights.dtype.kind in "biu" else np.float64)[order_by]
+        if np.all(weights == 1):
+            weights = None
+
+    return offsets, targets[order_by], weights
+
+
+def from_edges(order: int, sources: Sequence[int], targets: Sequence[int], weights: Sequence[Any] | None = None,
+               variant = "list", weighted = False, directed = False, default_value: Any = None) -> FrozenGraph:
+    """build a FrozenGraph from edge arrays as if add_edge had been called for every edge in order
+
+    (a repeated edge overwrites the weight, and in a successor graph a vertex keeps only its last edge)"""
+
+    sources = np.asarray(sources, dtype = np.int64)
+    targets = np.asarray(targets, dtype = np.int64)
+    if len(sources) != len(targets) or (weights is not None and len(weights) != len(sources)):
+        raise ValueError("edge arrays must have the same length")
+    if len(sources) and (min(sources.min(), targets.min()) < 0 or max(sources.max(), targets.max()) >= order):
+        raise IndexError("edge endpoints must be vertices of the graph")
+
+    if variant == "successor":
+        directed = True
+        # keep the last edge of every source
+        order_by = np.argsort(sources, kind = "stable")
+        keep = np.ones(len(order_by), dtype = bool)
+        keep[:-1] = np.diff(sources[order_by]) != 0
+        last = order_by[keep]
+        sources, targets = sources[last], targets[last]
+        weights = None if weights is None else np.asarray(weights)[last]
+
+    elif not directed:
+        # store both directions, interleaved so that later edges still win on duplicates
+        sources, targets = np.column_stack([sources, targets]).ravel(), np.column_stack([targets, sources]).ravel()
+        if weights is not None:
+            weights = np.repeat(np.asarray(weights), 2)
+
+    offsets, csr_targets, csr_weights = build_csr(order, sources, targets, weights, unique = True)
+
+    size = len(csr_targets)
+    if not directed:
+        loops = int(np.count_nonzero(np.repeat(np.arange(order), np.diff(offsets)) == csr_targets))
+        size = (size + loops) // 2
+
+    return FrozenGraph(offsets, csr_targets, csr_weights, size, weighted, directed, variant, default_value)
@@ -0,0 +1,188 @@
+import numpy as np
+
+from .graph import Graph, SuccessorGraph
+from .frozen import FrozenGraph, from_edges, sorted_unique
+
+
+def _build(order: int, sources: np.ndarray, targets: np.ndarray, rng: np.random.Generator, variant: str,
+           directed: bool, weights: tuple[int, int] | None) -> Graph | SuccessorGraph | FrozenGraph:
+    """helper function that turns sampled edge arrays into a graph of a variant"""
+
+    frozen_variant = "list" if variant == "frozen" else variant
+    if frozen_variant not in ("list", "matrix", "successor"):
+        raise TypeError(f"no graph variant named '{variant}'")
+
+    w = None
+    if weights is not None:
+        w = rng.integers(weights[0], weights[1] + 1, len(sources))
+
+    frozen = from_edges(order, sources, targets, w, frozen_variant, weights is not None, directed)
+    return frozen if variant == "frozen" else frozen.thaw()
+
+
+def _sample_indices(total: int, k: int, rng: np.random.Generator) -> np.ndarray:
+    """helper function that samples k distinct integers from range(total), sorted
+
+    meant for k <= total / 2, so every round accepts at least half of its candidates"""
+
+    result = np.zeros(0, dtype = np.int64)
+    while len(result) < k:
+        # oversample for the expected collisions, then drop duplicates and values already drawn
+        missing = k - len(result)
+        candidates = sorted_unique(rng.integers(0, total, int(missing * total / (total - len(result)) * 1.1) + 16))
+        if len(result):
+            position = np.searchsorted(result, candidates)
+            drawn = result[np.minimum(position, len(result) - 1)] == candidates
+            candidates, position = candidates[~drawn], position[~drawn]
+        else:
+            position = np.zeros(len(candidates), dtype = np.int64)
+
+        # keep a random subset of the new values if there are too many, then merge them in without a sort
+        if len(candidates) > missing:
+            keep = np.sort(rng.choice(len(candidates), missing, replace = False))
+            candidates, position = candidates[keep], position[keep]
+        result = np.insert(result, position, candidates)
+
+    return result
+
+
+def _decode_pairs(indices: np.ndarray, n: int, directed: bool) -> tuple[np.ndarray, np.ndarray]:
+    """helper function that turns pair indices into non-loop vertex pairs
+
+    directed: index a * (n - 1) + c is the pair (a, c) with c shifted past a.
+    undirected: indices enumerate the pairs a < b row by row, row a starts at a * (2n - a - 1) / 2"""
+
+    if directed:
+        a, c = indices // (n - 1), indices % (n - 1)
+        return a, c + (c >= a)
+
+    def start(a: np.ndarray) -> np.ndarray:
+        return a * (2 * n - a - 1) // 2
+
+    # invert the row start with a square root, then correct rounding errors
+    a = np.floor(n - 0.5 - np.sqrt((n - 0.5) ** 2 - 2 * indices.astype(np.float64))).astype(np.int64)
+    a = np.clip(a, 0, max(n - 2, 0))
+    a -= start(a) > indices
+    a += start(a + 1) <= indices
+    return a, indices - start(a) + a + 1
+
+
+def _sample_pairs(n: int, m: int, directed: bool, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """helper function that samples m distinct non-loop vertex pairs uniformly
+
+    (unordered pairs with a < b for undirected graphs). dense graphs sample the pairs to leave out instead"""
+
+    pairs = n * (n - 1) // (1 if directed else 2)
+    if m > pairs // 2:
+        keep = np.ones(pairs, dtype = bool)
+        keep[_sample_indices(pairs, pairs - m, rng)] = False
+        indices = np.flatnonzero(keep)
+    else:
+        indices = _sample_indices(pairs, m, rng)
+
+    return _decode_pairs(rng.permutation(indices), n, directed)
+
+
+# GENERATORS
+def erdos_renyi(n: int, p: float | None = None, m: int | None = None, seed: int | None = None, variant = "list",
+                directed = False, weights: tuple[int, int] | None = None) -> Graph | SuccessorGraph | FrozenGraph:
+    """generate a uniform random graph with n vertices, either with edge probability p (G(n, p))
+    or with exactly m edges (G(n, m)).
+
+    weights, if given, is an inclusive (low, high) range of random integer edge weights"""
+
+    if n < 0:
+        raise ValueError("amount of vertices must not be negative")
+    if (p is None) == (m is None):
+        raise ValueError("exactly one of p and m must be given")
+
+    rng = np.random.default_rng(seed)
+    pairs = n * (n - 1) // (1 if directed else 2)
+
+    if p is not None:
+        if not 0 <= p <= 1:
+            raise ValueError("p must be between 0 and 1")
+        m = int(rng.binomial(pairs, p)) if pairs else 0
+    if m > pairs:
+        raise ValueError(f"a graph with {n} vertices has at most {pairs} edges")
+
+    sources, targets = _sample_pairs(n, m, directed, rng)
+    return _build(n, sources, targets, rng, variant, directed, weights)
+
+
+def barabasi_albert(n: int, m: int, seed: int | None = None, variant = "list", directed = False,
+                    weights: tuple[int, int] | None = None) -> Graph | SuccessorGraph | FrozenGraph:
+    """generate a scale-free graph by preferential attachment, every vertex attaches m edges to earlier vertices
+
+    uses the Batagelj-Brandes edge array, with the copy chain resolved by vectorized pointer jumping.
+    loops and repeated edges are dropped, so a few vertices may end up with fewer than m edges"""
+
+    if n < 0:
+        raise ValueError("amount of vertices must not be negative")
+    if m < 1:
+        raise ValueError("m must be positive")
+
+    rng = np.random.default_rng(seed)
+
+    # slot 2k holds the new vertex of edge k, slot 2k + 1 copies a uniformly chosen earlier slot
+    k = np.arange(n * m, dtype = np.int64)
+    values = np.empty(2 * n * m, dtype = np.int64)
+    values[0::2] = k // m
+    pointer = np.arange(2 * n * m, dtype = np.int64)
+    pointer[1::2] = (rng.random(n * m) * (2 * k + 1)).astype(np.int64)
+
+    # follow copy pointers until every slot points at a fixed vertex slot
+    while np.any(pointer % 2 == 1):
+        pointer = pointer[pointer]
+    resolved = values[pointer]
+
+    sources, targets = resolved[0::2], resolved[1::2]
+    keep = sources != targets
+    return _build(n, sources[keep], targets[keep], rng, variant, directed, weights)
+
+
+def grid(rows: int, columns: int, periodic = False, variant = "list", directed = False, seed: int | None = None,
+         weights: tuple[int, int] | None = None) -> Graph | SuccessorGraph | FrozenGraph:
+    """generate a rows x columns grid graph, vertex (r, c) has index r * columns + c
+
+    if periodic is True, the grid wraps around into a torus"""
+
+    if rows < 0 or columns < 0:
+        raise ValueError("grid dimensions must not be negative")
+
+    rng = np.random.default_rng(seed)
+    index = np.arange(rows * columns, dtype = np.int64).reshape(rows, columns)
+
+    if periodic:
+        right = (index, np.roll(index, -1, axis = 1)) if columns > 1 else (index[:, :0], index[:, :0])
+        down = (index, np.roll(index, -1, axis = 0)) if rows > 1 else (index[:0], index[:0])
+    else:
+        right = (index[:, :-1], index[:, 1:])
+        down = (index[:-1], index[1:])
+
+    sources = np.concatenate([right[0].ravel(), down[0].ravel()])
+    targets = np.concatenate([right[1].ravel(), down[1].ravel()])
+    return _build(rows * columns, sources, targets, rng, variant, directed, weights)
+
+
+def random_functional(n: int, seed: int | None = None, loops = True, variant = "successor",
+                      weights: tuple[int, int] | None = None) -> Graph | SuccessorGraph | FrozenGraph:
+    """generate a random functional graph: every vertex gets exactly one outgoing edge to a uniform vertex
+
+    if loops is False, a vertex never points to itself (requires n > 1)"""
+
+    if n < 0:
+        raise ValueError("amount of vertices must not be negative")
+    if not loops and n == 1:
+        raise ValueError("a functional graph without loops needs at least 2 vertices")
+
+    rng = np.random.default_rng(seed)
+    sources = np.arange(n, dtype = np.int64)
+    if loops:
+        targets = rng.integers(0, n, n)
+    else:
+        # draw from the n - 1 other vertices
+        targets = rng.integers(0, max(n - 1, 1), n)
+        targets += targets >= sources
+
+    return _build(n, sources, targets, rng, variant, True, weights)
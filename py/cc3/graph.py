@@ -1,5 +1,8 @@
 from __future__ import annotations
-from collections.abc import Sequence
+import gc
+from array import array
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
 from typing import Any, Optional
 
 
@@ -14,6 +17,11 @@ class Graph:
         self.weighted = False
         self.directed = False
         self.adj = []
+        self.version = 0  # incremented on every mutation (used to invalidate caches)
+
+        # copy-on-write state: while _shared is True, rows not in _owned are shared with a snapshot
+        self._shared = False
+        self._owned: set[int] = set()
 
     def get_data(self) -> Sequence[Sequence[Edge | int]]:
         """returns the graph's raw adjacency data"""
@@ -93,6 +101,78 @@ class Graph:
         """clears all edges in the graph"""
         raise NotImplementedError()
 
+    # CONVERSION
+    def to_list(self) -> ListGraph:
+        """returns a ListGraph with the same vertices and edges"""
+        raise NotImplementedError()
+
+    def to_matrix(self, default_value: Any = None) -> MatrixGraph:
+        """returns a MatrixGraph with the same vertices and edges"""
+        raise NotImplementedError()
+
+    def to_successor(self) -> SuccessorGraph:
+        """returns a SuccessorGraph with the same vertices and edges.
+
+        raises a ValueError if a vertex has more than one outgoing edge"""
+        raise NotImplementedError()
+
+    # SNAPSHOTS
+    def snapshot(self) -> Graph:
+        """returns a read-only view of the graph as it is now, which later mutations do not affect.
+
+        the view shares its adjacency rows with the graph, a row is only copied when the graph
+        first modifies it after the snapshot (copy-on-write), so a snapshot costs one list copy of
+        the row references and every mutation afterwards copies at most the rows it touches.
+        bfs, dfs and every other read-only function accept a snapshot like the original graph.
+
+        NOTE: take snapshots on the writing thread (or under its lock), then hand them to readers"""
+        raise NotImplementedError()
+
+    def _snapshot(self, cls: type) -> Graph:
+        """helper function that creates a view of the class (cls) and marks every row as shared"""
+
+        view = cls.__new__(cls)
+        view.__dict__.update(self.__dict__)
+        view.adj = list(self.adj)
+        view._shared = False
+        view._owned = set()
+
+        self._shared = True
+        self._owned = set()
+        return view
+
+    def _own(self, v: int) -> None:
+        """helper function that copies row (v) before it is modified, if a snapshot still shares it"""
+        raise NotImplementedError()
+
+    # COPYING
+    def copy(self) -> Graph:
+        """returns an independent copy of the graph (much faster than copy.deepcopy)"""
+        raise NotImplementedError()
+
+    def __getstate__(self) -> dict:
+        """returns the graph as flat arrays of destinations and weights, used by pickle and copy.deepcopy
+        (instead of one object per edge with a reference back to the graph)"""
+        raise NotImplementedError()
+
+    def __setstate__(self, state: dict) -> None:
+        """rebuild the graph from the flat arrays of __getstate__ (or the plain __dict__ of an older pickle)"""
+        raise NotImplementedError()
+
+    def _state(self) -> dict:
+        """helper function that returns the plain attributes of the graph (without adjacency or snapshot data)"""
+
+        return {k: v for k, v in self.__dict__.items() if k not in ("adj", "_shared", "_owned")}
+
+    def _restore(self, state: dict) -> None:
+        """helper function that loads the state of a graph pickled before the flat format
+        (its plain __dict__, with the adjacency data stored as is)"""
+
+        self.__dict__.update(state)
+        self.version = state.get("version", 0)
+        self._shared = False
+        self._owned = set()
+
 
 class Edge:
     """an edge class used in the ListGraph to store both weighted and unweighted instances"""
@@ -182,18 +262,23 @@ class ListGraph(Graph):
 
     # VERTEX CONTROL
     def add_vertex(self, amount = 1) -> None:
+        self.version += 1
         if amount < 0:
             raise ValueError("amount must not be negative")
 
+        if self._shared:
+            self._owned.update(range(self.order, self.order + amount))
         self.order += amount
         self.adj.extend([[] for _ in range(amount)])
 
     # TODO remove_vertex
 
     def reset(self) -> None:
+        self.version += 1
         self.order = 0
         self.size = 0
         self.adj = []
+        self._shared = False
 
     # EDGE ACCESS
     def is_edge(self, a: int, b: int) -> bool:
@@ -221,6 +306,7 @@ class ListGraph(Graph):
 
     # EDGE CONTROL
     def add_edge(self, a: int, b: int, w: Any = 1, auto_expand = True) -> None:
+        self.version += 1
         if self.is_edge(a, b):
             self.set_weight(a, b, w)
             if not self.directed:
@@ -238,12 +324,15 @@ class ListGraph(Graph):
             if not 0 <= b < self.order:
                 raise IndexError(f"vertex ({b}) does not exist in graph")
 
+        self._own(a)
         self.adj[a].append(Edge(a, b, w, self))
         if not self.directed:
+            self._own(b)
             self.adj[b].append(Edge(b, a, w, self))
         self.size += 1
 
     def remove_edge(self, a: int, b: int) -> None:
+        self.version += 1
         if not 0 <= a < self.order:
             raise IndexError(f"vertex ({a}) does not exist in graph")
         if not 0 <= b < self.order:
@@ -257,6 +346,7 @@ class ListGraph(Graph):
     def _remove_edge(self, a: int, b: int) -> None:
         """helper function for remove_edge"""
 
+        self._own(a)
         for i, e in enumerate(self.adj[a]):
             if e.dest == b:
                 del self.adj[a][i]
@@ -266,11 +356,87 @@ class ListGraph(Graph):
     # TODO move_edge
 
     def set_weight(self, a: int, b: int, w: Any = 1) -> None:
+        self.version += 1
+        self._own(a)
         self.get_edge(a, b).weight = w
 
     def clear(self) -> None:
+        self.version += 1
         self.size = 0
         self.adj = [[] for _ in range(self.order)]
+        self._shared = False
+
+    # CONVERSION
+    def to_list(self) -> ListGraph:
+        graph = ListGraph(self.order, self.weighted, self.directed)
+        graph.adj = [[Edge(e.origin, e.dest, e.weight, graph) for e in n] for n in self.adj]
+        graph.size = self.size
+        return graph
+
+    def to_matrix(self, default_value: Any = None) -> MatrixGraph:
+        graph = MatrixGraph(self.order, self.weighted, self.directed, default_value)
+        for n, row in zip(self.adj, graph.adj):
+            for e in n:
+                row[e.dest] = e.weight
+        graph.size = self.size
+        return graph
+
+    def to_successor(self) -> SuccessorGraph:
+        graph = SuccessorGraph(self.order, self.weighted)
+        for v, n in enumerate(self.adj):
+            if len(n) > 1 and not (len(n) == 2 and not self.directed and n[0].dest == n[1].dest == v):
+                raise ValueError(f"vertex ({v}) has more than one outgoing edge")
+            if n:
+                graph.adj[v] = Edge(v, n[0].dest, n[0].weight, graph)
+                graph.size += 1
+        return graph
+
+    # SNAPSHOTS
+    def snapshot(self) -> ListGraph:
+        return self._snapshot(ListSnapshot)
+
+    def _own(self, v: int) -> None:
+        if self._shared and 0 <= v < self.order and v not in self._owned:
+            # edges are mutable (set_weight), so the copy gets its own Edge objects
+            self.adj[v] = [Edge(e.origin, e.dest, e.weight, self) for e in self.adj[v]]
+            self._owned.add(v)
+
+    # COPYING
+    def copy(self) -> ListGraph:
+        # rebuilding from the flat state is faster than copying Edge by Edge
+        graph = ListGraph.__new__(ListGraph)
+        graph.__setstate__(self.__getstate__())
+        return graph
+
+    def __getstate__(self) -> dict:
+        state = self._state()
+        state["lengths"] = array("q", [len(n) for n in self.adj])
+        state["dests"] = array("q", [e.dest for n in self.adj for e in n])
+        state["weights"] = _pack_weights([e.weight for n in self.adj for e in n])
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        if "lengths" not in state:
+            self._restore(state)
+            for n in self.adj:
+                for e in n:
+                    e.parent = self
+            return
+
+        state = dict(state)
+        lengths, dests = state.pop("lengths"), state.pop("dests")
+        weights = _unpack_weights(state.pop("weights"), len(dests))
+        self.__dict__.update(state)
+        self._shared = False
+        self._owned = set()
+
+        self.adj = []
+        start = 0
+        with _paused_gc():
+            for v, length in enumerate(lengths):
+                end = start + length
+                self.adj.append([Edge(v, d, w, self) for d, w in zip(dests[start:end], weights[start:end])])
+                start = end
 
 
 class MatrixGraph(Graph):
@@ -345,20 +511,28 @@ class MatrixGraph(Graph):
 
     # VERTEX CONTROL
     def add_vertex(self, amount = 1) -> None:
+        self.version += 1
         if amount < 0:
             raise ValueError("amount must not be negative")
 
         self.order += amount
-        for n in self.adj:
-            n.extend([self.default_value] * amount)
+        if self._shared:
+            # every row grows, so copy them all instead of extending the shared ones
+            self.adj = [n + [self.default_value] * amount for n in self.adj]
+            self._shared = False
+        else:
+            for n in self.adj:
+                n.extend([self.default_value] * amount)
         self.adj.extend([[self.default_value] * self.order for _ in range(amount)])
 
     # TODO remove_vertex
 
     def reset(self) -> None:
+        self.version += 1
         self.order = 0
         self.size = 0
         self.adj = []
+        self._shared = False
 
     # EDGE ACCESS
     def is_edge(self, a: int, b: int) -> bool:
@@ -382,6 +556,7 @@ class MatrixGraph(Graph):
 
     # EDGE CONTROL
     def add_edge(self, a: int, b: int, w: Any = 1, auto_expand = True) -> None:
+        self.version += 1
         if self.is_edge(a, b):
             self.set_weight(a, b, w)
             if not self.directed:
@@ -399,30 +574,122 @@ class MatrixGraph(Graph):
             if not 0 <= b < self.order:
                 raise IndexError(f"vertex ({b}) does not exist in graph")
 
+        self._own(a)
         self.adj[a][b] = w
         if not self.directed:
+            self._own(b)
             self.adj[b][a] = w
         self.size += 1
 
     def remove_edge(self, a: int, b: int) -> None:
+        self.version += 1
         if not 0 <= a < self.order:
             raise IndexError(f"vertex ({a}) does not exist in graph")
         if not 0 <= b < self.order:
             raise IndexError(f"vertex ({b}) does not exist in graph")
 
+        self._own(a)
         self.adj[a][b] = self.default_value
         if not self.directed:
+            self._own(b)
             self.adj[b][a] = self.default_value
         self.size -= 1
 
     # TODO move_edge
 
     def set_weight(self, a: int, b: int, w: Any = 1) -> None:
+        self.version += 1
+        self._own(a)
         self.adj[a][b] = w
 
     def clear(self) -> None:
+        self.version += 1
         self.size = 0
         self.adj = [[self.default_value] * self.order for _ in range(self.order)]
+        self._shared = False
+
+    # CONVERSION
+    def to_list(self) -> ListGraph:
+        graph = ListGraph(self.order, self.weighted, self.directed)
+        for i, n in enumerate(self.adj):
+            row = graph.adj[i]
+            for j, w in enumerate(n):
+                if w != self.default_value:
+                    row.append(Edge(i, j, w, graph))
+                    if i == j and not self.directed:
+                        # undirected loops are stored twice in a ListGraph
+                        row.append(Edge(i, j, w, graph))
+        graph.size = self.size
+        return graph
+
+    def to_matrix(self, default_value: Any = None) -> MatrixGraph:
+        graph = MatrixGraph(0, self.weighted, self.directed, default_value)
+        graph.order = self.order
+        graph.adj = [[default_value if w == self.default_value else w for w in n] for n in self.adj]
+        graph.size = self.size
+        return graph
+
+    def to_successor(self) -> SuccessorGraph:
+        graph = SuccessorGraph(self.order, self.weighted)
+        for i, n in enumerate(self.adj):
+            for j, w in enumerate(n):
+                if w == self.default_value:
+                    continue
+                if graph.adj[i] is not None:
+                    raise ValueError(f"vertex ({i}) has more than one outgoing edge")
+                graph.adj[i] = Edge(i, j, w, graph)
+                graph.size += 1
+        return graph
+
+    # SNAPSHOTS
+    def snapshot(self) -> MatrixGraph:
+        return self._snapshot(MatrixSnapshot)
+
+    def _own(self, v: int) -> None:
+        if self._shared and 0 <= v < self.order and v not in self._owned:
+            self.adj[v] = list(self.adj[v])
+            self._owned.add(v)
+
+    # COPYING
+    def copy(self) -> MatrixGraph:
+        graph = self.to_matrix(self.default_value)
+        graph.version = self.version
+        return graph
+
+    def __getstate__(self) -> dict:
+        state = self._state()
+        # only the edges are stored, the rest of the matrix is default_value
+        lengths, dests, weights = [], [], []
+        for n in self.adj:
+            row = [i for i, w in enumerate(n) if w != self.default_value]
+            lengths.append(len(row))
+            dests.extend(row)
+            weights.extend([n[i] for i in row])
+
+        state["lengths"] = array("q", lengths)
+        state["dests"] = array("q", dests)
+        state["weights"] = _pack_weights(weights)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        if "lengths" not in state:
+            self._restore(state)
+            return
+
+        state = dict(state)
+        lengths, dests = state.pop("lengths"), state.pop("dests")
+        weights = _unpack_weights(state.pop("weights"), len(dests))
+        self.__dict__.update(state)
+        self._shared = False
+        self._owned = set()
+
+        self.adj = [[self.default_value] * self.order for _ in range(self.order)]
+        start = 0
+        for row, length in zip(self.adj, lengths):
+            end = start + length
+            for d, w in zip(dests[start:end], weights[start:end]):
+                row[d] = w
+            start = end
 
 
 class SuccessorGraph:
@@ -436,6 +703,7 @@ class SuccessorGraph:
         self.size = 0
 
         self.weighted = weighted
+        self.version = 0
 
         self.adj: list[Edge | None] = [None] * v
 
@@ -500,6 +768,7 @@ class SuccessorGraph:
     def add_vertex(self, amount = 1) -> None:
         """push vertices to the end of the graph (newest indices)"""
 
+        self.version += 1
         if amount < 0:
             raise ValueError("amount must not be negative")
 
@@ -509,6 +778,7 @@ class SuccessorGraph:
     # TODO remove_vertex
 
     def reset(self) -> None:
+        self.version += 1
         self.order = 0
         self.size = 0
         self.adj = []
@@ -552,6 +822,7 @@ class SuccessorGraph:
 
         if vertex does not exist and auto_expand is True, the graph will automatically add vertices."""
 
+        self.version += 1
         if self.is_edge(a, b):
             self.set_weight(a, w = w)
             return
@@ -578,6 +849,7 @@ class SuccessorGraph:
     def remove_edge(self, a: int, b: int) -> None:
         """attempts to remove the edge between (a) and (b)"""
 
+        self.version += 1
         if not 0 <= a < self.order:
             raise IndexError(f"vertex ({a}) does not exist in graph")
         if not 0 <= b < self.order:
@@ -591,6 +863,7 @@ class SuccessorGraph:
     def move_edge(self, a: int, b: int) -> None:
         """attempts to redirect the edge starting on (a) to end at (b)"""
 
+        self.version += 1
         if not 0 <= b < self.order:
             raise IndexError(f"vertex ({b}) does not exist in graph")
 
@@ -601,11 +874,138 @@ class SuccessorGraph:
 
         the parameter (b) is optional for checking if the requested edge exists"""
 
+        self.version += 1
         if b is None:
             self.get_outgoing(a).weight = w
         else:
             self.get_edge(a, b).weight = w
 
     def clear(self) -> None:
+        self.version += 1
         self.size = 0
-        self.adj = [None] * self.order
\ No newline at end of file
+        self.adj = [None] * self.order
+
+    # CONVERSION
+    def to_list(self) -> ListGraph:
+        """returns a directed ListGraph with the same vertices and edges"""
+
+        graph = ListGraph(self.order, self.weighted, True)
+        for e in self.adj:
+            if e is not None:
+                graph.adj[e.origin].append(Edge(e.origin, e.dest, e.weight, graph))
+        graph.size = self.size
+        return graph
+
+    def to_matrix(self, default_value: Any = None) -> MatrixGraph:
+        """returns a directed MatrixGraph with the same vertices and edges"""
+
+        graph = MatrixGraph(self.order, self.weighted, True, default_value)
+        for e in self.adj:
+            if e is not None:
+                graph.adj[e.origin][e.dest] = e.weight
+        graph.size = self.size
+        return graph
+
+    def to_successor(self) -> SuccessorGraph:
+        """returns a copy of the graph"""
+
+        graph = SuccessorGraph(self.order, self.weighted)
+        graph.adj = [None if e is None else Edge(e.origin, e.dest, e.weight, graph) for e in self.adj]
+        graph.size = self.size
+        return graph
+
+    # COPYING
+    def copy(self) -> SuccessorGraph:
+        """returns an independent copy of the graph (much faster than copy.deepcopy)"""
+
+        graph = self.to_successor()
+        graph.version = self.version
+        return graph
+
+    def __getstate__(self) -> dict:
+        """returns the graph as flat arrays of destinations (-1 for no edge) and weights,
+        used by pickle and copy.deepcopy"""
+
+        state = {k: v for k, v in self.__dict__.items() if k != "adj"}
+        state["dests"] = array("q", [-1 if e is None else e.dest for e in self.adj])
+        state["weights"] = _pack_weights([e.weight for e in self.adj if e is not None])
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """rebuild the graph from the flat arrays of __getstate__ (or the plain __dict__ of an older pickle)"""
+
+        if "dests" not in state:
+            self.__dict__.update(state)
+            self.version = state.get("version", 0)
+            for e in self.adj:
+                if e is not None:
+                    e.parent = self
+            return
+
+        state = dict(state)
+        dests = state.pop("dests")
+        weights = iter(_unpack_weights(state.pop("weights"), sum(1 for d in dests if d != -1)))
+        self.__dict__.update(state)
+        with _paused_gc():
+            self.adj = [None if d == -1 else Edge(v, d, next(weights), self) for v, d in enumerate(dests)]
+
+
+# SERIALIZATION
+def _pack_weights(weights: list[Any]) -> array | list[Any] | None:
+    """helper function that stores edge weights compactly: None if they are all 1,
+    an int64/float64 array if they are all ints/floats, otherwise the list itself"""
+
+    if all(type(w) is int for w in weights):
+        if all(w == 1 for w in weights):
+            return None
+        try:
+            return array("q", weights)
+        except OverflowError:
+            return weights
+    if all(type(w) is float for w in weights):
+        return array("d", weights)
+    return weights
+
+
+@contextmanager
+def _paused_gc() -> Iterator[None]:
+    """helper context manager that pauses the cyclic garbage collector while many edges are created
+
+    every Edge references its graph, so without the pause the collector keeps rescanning the new edges"""
+
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _unpack_weights(weights: array | list[Any] | None, amount: int) -> Sequence[Any]:
+    """helper function that undoes _pack_weights"""
+
+    return [1] * amount if weights is None else weights
+
+
+# SNAPSHOTS
+class _ReadOnly:
+    """a mixin that rejects every mutation of a graph snapshot"""
+
+    def _read_only(self, *args, **kwargs) -> None:
+        raise TypeError("graph snapshots are read-only")
+
+    add_vertex = reset = add_edge = remove_edge = move_edge = set_weight = clear = _read_only
+
+    def snapshot(self) -> Graph:
+        """returns the snapshot itself, since it never changes"""
+
+        return self
+
+
+class ListSnapshot(_ReadOnly, ListGraph):
+    """a read-only view of a ListGraph, created by ListGraph.snapshot()"""
+
+
+class MatrixSnapshot(_ReadOnly, MatrixGraph):
+    """a read-only view of a MatrixGraph, created by MatrixGraph.snapshot()"""
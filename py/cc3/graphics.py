@@ -1,8 +1,10 @@
 import tkinter as tk
 import numpy as np
-import math, random
+import math, os, random
 
 from .graph import Graph, ListGraph, MatrixGraph, SuccessorGraph
+from .raster import Raster
+from . import layout
 
 # CONSTANTS
 screen_width = 400
@@ -34,17 +36,20 @@ def get_edges(graph: Graph | SuccessorGraph) -> np.ndarray:
     edges = []
 
     if isinstance(graph, ListGraph):
+        seen = set()
         for n in graph.adj:
             for e in n:
-                if not graph.directed and (e.dest, e.origin) in edges:
-                    continue
+                if not graph.directed:
+                    if (e.dest, e.origin) in seen:
+                        continue
+                    seen.add((e.origin, e.dest))
                 edges.append((e.origin, e.dest))
 
     elif isinstance(graph, MatrixGraph):
         for i, n in enumerate(graph.adj):
             for j, e in enumerate(n):
                 if e != graph.default_value:
-                    if not graph.directed and (j, i) in edges:
+                    if not graph.directed and j < i:
                         continue
                     edges.append((i, j))
 
@@ -53,124 +58,291 @@ def get_edges(graph: Graph | SuccessorGraph) -> np.ndarray:
             if e is not None:
                 edges.append((e.origin, e.dest))
 
-    return np.array(edges, dtype = np.int64)
+    return np.array(edges, dtype = np.int64).reshape(-1, 2)
 
 
-def display(graph: Graph | SuccessorGraph) -> None:
-    """create an interactive visualization of the provided graph in tkinter"""
+def random_position(order: int, width = screen_width, height = screen_height) -> np.ndarray:
+    """helper function that scatters vertices randomly across the frame"""
 
-    # tkinter initialization
-    root = tk.Tk()
-    canvas = tk.Canvas(root, width = screen_width, height = screen_height, bg = colour_background)
-    canvas.pack()
+    return np.array([[random.randint(10, width - 10), random.randint(10, height - 10)] for _ in range(order)],
+                    dtype = np.float64).reshape(-1, 2)
 
-    # initialize data
-    edges = get_edges(graph)
 
-    position = np.array(
-        [[random.randint(10, screen_width - 10), random.randint(10, screen_height - 10)] for _ in range(graph.order)])
-    velocity = np.zeros((graph.order, 2))
+# PHYSICS
+def vertex_repulsion(position: np.ndarray, movement: np.ndarray) -> None:
+    """force each vertex apart"""
 
-    selected_vertex = None
+    displacement = position[:, np.newaxis, :] - position[np.newaxis, :, :]
+    dsq = np.sum(displacement ** 2, axis = 2, dtype = np.float64)
+    np.fill_diagonal(dsq, np.inf)
+    distance = np.maximum(np.sqrt(dsq), escape_force)
+    dsq = np.maximum(dsq, escape_force)
 
-    # create canvas objects
-    vertices = []
-    labels = []
-    lines = []
+    magnitude = repulsion / dsq
+    unit_force = displacement / distance[:, :, np.newaxis]
+    force = magnitude[:, :, np.newaxis] * unit_force
+    net_force = np.sum(force, axis = 1)
 
-    arrow = tk.LAST if isinstance(graph, SuccessorGraph) or graph.directed else None
-    for i in range(graph.size):
-        lines.append(canvas.create_line(0, 0, 0, 0, fill = colour_edge, width = edge_thickness, arrow = arrow))
+    movement += net_force
 
-    for i in range(graph.order):
-        vertices.append(canvas.create_oval(0, 0, 0, 0, fill = colour_vertex, outline = colour_vertex_outline,
-                                           width = outline_thickness))
-        labels.append(canvas.create_text(0, 0, text = str(i), font = ("Arial", node_radius * 4 // 5, "bold"),
-                                         fill = colour_foreground))
 
-    # UPDATE
-    def vertex_repulsion(movement: np.ndarray) -> None:
-        """force each vertex apart"""
+def grid_repulsion(position: np.ndarray, movement: np.ndarray, cell: float, crowded = 64) -> None:
+    """force each vertex apart from the vertices near it, bucketed into a grid of square cells
 
-        displacement = position[:, np.newaxis, :] - position[np.newaxis, :, :]
-        dsq = np.sum(displacement ** 2, axis = 2, dtype = np.float64)
-        np.fill_diagonal(dsq, np.inf)
+    an approximation of vertex_repulsion for large graphs: vertices in the same cell repel each other
+    exactly, the 8 surrounding cells repel as single points at their centroid and anything further
+    is ignored. in cells with more than crowded vertices, the other vertices of the cell also act
+    as one point at their centroid, so the cost stays linear in the amount of vertices"""
+
+    order = len(position)
+    if order < 2:
+        return
+
+    cells = np.floor((position - position.min(axis = 0)) / cell).astype(np.int64)
+    rows = int(cells[:, 1].max()) + 3
+    key = (cells[:, 0] + 1) * rows + cells[:, 1] + 1
+    total = (int(cells[:, 0].max()) + 3) * rows
+
+    count = np.bincount(key, minlength = total)
+    summed = np.column_stack([np.bincount(key, position[:, 0], total), np.bincount(key, position[:, 1], total)])
+    centroid = summed / np.maximum(count, 1)[:, None]
+
+    def push(a: np.ndarray, displacement: np.ndarray, weight: np.ndarray | float = 1) -> None:
+        dsq = np.sum(displacement ** 2, axis = 1)
         distance = np.maximum(np.sqrt(dsq), escape_force)
-        dsq = np.maximum(dsq, escape_force)
+        force = (weight * repulsion / np.maximum(dsq, escape_force) / distance)[:, None] * displacement
+        movement[:, 0] += np.bincount(a, force[:, 0], order)
+        movement[:, 1] += np.bincount(a, force[:, 1], order)
 
-        magnitude = repulsion / dsq
-        unit_force = displacement / distance[:, :, np.newaxis]
-        force = magnitude[:, :, np.newaxis] * unit_force
-        net_force = np.sum(force, axis = 1)
+    # surrounding cells, as one point each
+    everyone = np.arange(order, dtype = np.int64)
+    for neighbour in (dx * rows + dy for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy):
+        other = key + neighbour
+        near = count[other] > 0
+        push(everyone[near], position[near] - centroid[other[near]], count[other[near]])
 
-        movement += net_force
+    # crowded cells, the other vertices as one point
+    size = count[key]
+    crowd = size > crowded
+    others = (summed[key[crowd]] - position[crowd]) / (size[crowd] - 1)[:, None]
+    push(everyone[crowd], position[crowd] - others, size[crowd] - 1)
 
-    def edge_tension(movement: np.ndarray) -> None:
-        """edges act as springs, holding the vertices in place"""
+    # the remaining cells pair by pair. vertices sorted by cell, so a cell is a contiguous range of by_cell
+    by_cell = np.argsort(key, kind = "stable")
+    a, size = everyone[~crowd], size[~crowd]
+    inner = np.arange(int(size.sum()), dtype = np.int64) - np.repeat(np.cumsum(size) - size, size)
+    b = by_cell[np.repeat((np.cumsum(count) - count)[key[~crowd]], size) + inner]
+    a = np.repeat(a, size)
+    a, b = a[a != b], b[a != b]
+    push(a, position[a] - position[b])
 
-        displacement = position[edges[:, 1]] - position[edges[:, 0]]
 
-        distance = np.linalg.norm(displacement, axis = 1)
-        distance = np.maximum(distance, escape_force)
+def edge_tension(position: np.ndarray, edges: np.ndarray, movement: np.ndarray) -> None:
+    """edges act as springs, holding the vertices in place"""
 
-        magnitude = spring_stiffness * (distance - spring_length)
+    displacement = position[edges[:, 1]] - position[edges[:, 0]]
 
-        unit_force = displacement / distance[:, np.newaxis]
-        force = magnitude[:, np.newaxis] * unit_force
-        np.add.at(movement, edges[:, 0], force)
-        np.add.at(movement, edges[:, 1], -force)
+    distance = np.linalg.norm(displacement, axis = 1)
+    distance = np.maximum(distance, escape_force)
 
-    def central_gravity(movement: np.ndarray) -> None:
-        """gravity that holds vertices to the center of the frame"""
+    magnitude = spring_stiffness * (distance - spring_length)
 
-        center = np.array([screen_width / 2, screen_height / 2])
-        displacement = center - position
-        movement += displacement * center_gravity
+    unit_force = displacement / distance[:, np.newaxis]
+    force = magnitude[:, np.newaxis] * unit_force
+    np.add.at(movement, edges[:, 0], force)
+    np.add.at(movement, edges[:, 1], -force)
 
-    def update() -> None:
-        """apply physics calculations each frame
 
-        received partial physics help from ChatGPT"""
+def central_gravity(position: np.ndarray, movement: np.ndarray, width = screen_width, height = screen_height) -> None:
+    """gravity that holds vertices to the center of the frame"""
 
-        nonlocal position, velocity
+    center = np.array([width / 2, height / 2])
+    displacement = center - position
+    movement += displacement * center_gravity
 
-        movement = np.zeros((graph.order, 2))
-        vertex_repulsion(movement)
-        edge_tension(movement)
-        central_gravity(movement)
 
-        # update position and velocity
-        excluded_vel = None
-        excluded_pos = None
-        if selected_vertex is not None:
-            excluded_vel = velocity[selected_vertex]
-            excluded_pos = position[selected_vertex]
+def step(position: np.ndarray, velocity: np.ndarray, edges: np.ndarray, pinned: int | None = None,
+         width = screen_width, height = screen_height, cell: float | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """apply one frame of physics calculations, returns the new position and velocity
 
-        velocity = (velocity + movement) * damping
-        position = position.astype(np.float64)
-        position += velocity
+    if a cell size is given, repulsion only acts between nearby vertices (see grid_repulsion)
 
-        if selected_vertex is not None:
-            velocity[selected_vertex] = excluded_vel
-            position[selected_vertex] = excluded_pos
+    received partial physics help from ChatGPT"""
+
+    movement = np.zeros((len(position), 2))
+    if cell is None:
+        vertex_repulsion(position, movement)
+    else:
+        grid_repulsion(position, movement, cell)
+    edge_tension(position, edges, movement)
+    central_gravity(position, movement, width, height)
+
+    # update position and velocity
+    excluded_vel = None
+    excluded_pos = None
+    if pinned is not None:
+        excluded_vel = velocity[pinned].copy()
+        excluded_pos = position[pinned].copy()
+
+    velocity = (velocity + movement) * damping
+    position = position.astype(np.float64)
+    position += velocity
+
+    if pinned is not None:
+        velocity[pinned] = excluded_vel
+        position[pinned] = excluded_pos
+
+    position[:, 0] = np.clip(position[:, 0], node_radius, width - node_radius)
+    position[:, 1] = np.clip(position[:, 1], node_radius, height - node_radius)
+    return position, velocity
+
+
+def edge_segments(position: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """returns the on-screen line segments of the edges, trimmed to the border of each vertex"""
 
-        position[:, 0] = np.clip(position[:, 0], node_radius, screen_width - node_radius)
-        position[:, 1] = np.clip(position[:, 1], node_radius, screen_height - node_radius)
+    line_pos = position[edges]
+    distance = line_pos[:, 1] - line_pos[:, 0]
+    ratio = node_radius / np.maximum(np.linalg.norm(distance, axis = 1)[:, None], escape_force)
+    offset = distance * ratio
+    line_pos[:, 0] += offset
+    line_pos[:, 1] -= offset
+    return line_pos
 
-        line_pos = position[edges]
-        distance = line_pos[:, 1] - line_pos[:, 0]
-        ratio = node_radius / np.maximum(np.linalg.norm(distance, axis = 1)[:, None], escape_force)
-        offset = distance * ratio
-        line_pos[:, 0] += offset
-        line_pos[:, 1] -= offset
+
+# RASTER RENDERING
+def render(raster: Raster, position: np.ndarray, edges: np.ndarray, arrows = False,
+           highlight: int | None = None) -> None:
+    """draw a whole frame of the graph onto an off-screen raster"""
+
+    raster.clear()
+    segments = edge_segments(position, edges)
+    raster.draw_lines(segments, colour_edge, edge_thickness)
+    if arrows:
+        raster.draw_arrows(segments, colour_edge, edge_thickness)
+    raster.draw_discs(position, node_radius, colour_vertex, colour_vertex_outline, outline_thickness)
+    if highlight is not None:
+        raster.draw_discs(position[highlight], node_radius, colour_vertex, colour_vertex_highlight, outline_thickness)
+
+
+def export_frames(graph: Graph | SuccessorGraph, directory: str, frames = 1, fmt = "png",
+                  width = screen_width, height = screen_height, position: np.ndarray | None = None,
+                  steps_per_frame = 1) -> list[str]:
+    """render frames of the graph's layout to image files without opening a window
+
+    if a position array is given it is used as the layout, otherwise the physics simulation is run.
+    returns the paths of the written files"""
+
+    if fmt not in ("png", "ppm"):
+        raise ValueError(f"unsupported image format '{fmt}' (expected 'png' or 'ppm')")
+    os.makedirs(directory, exist_ok = True)
+
+    edges = get_edges(graph)
+    arrows = isinstance(graph, SuccessorGraph) or graph.directed
+    simulate = position is None
+
+    if simulate:
+        position = random_position(graph.order, width, height)
+    position = np.asarray(position, dtype = np.float64)
+    velocity = np.zeros((graph.order, 2))
+    cell = layout.repulsion_cell(graph.order, width, height)
+
+    raster = Raster(width, height, colour_background)
+    paths = []
+    for frame in range(frames):
+        if simulate:
+            for _ in range(steps_per_frame):
+                position, velocity = step(position, velocity, edges, width = width, height = height, cell = cell)
+
+        render(raster, position, edges, arrows)
+        path = os.path.join(directory, f"frame_{frame:05d}.{fmt}")
+        raster.save(path)
+        paths.append(path)
+
+    return paths
+
+
+def display(graph: Graph | SuccessorGraph, renderer = "canvas", initial = "auto",
+            cache: layout.LayoutCache | None = None) -> None:
+    """create an interactive visualization of the provided graph in tkinter
+
+    renderer "canvas" creates a tkinter item for every vertex, label and edge,
+    renderer "raster" draws each frame off-screen with numpy and blits it as a single image
+    (recommended for graphs with thousands of vertices or edges)
+
+    initial "auto" starts from the last layout of an identical graph if there is one and scatters the vertices
+    otherwise, initial "random" always scatters them, initial "cached" starts from the last layout
+    (or a multilevel layout, which takes a few seconds on graphs with thousands of vertices) and
+    initial "multilevel" always computes a multilevel layout.
+    when the window is closed, the final positions are stored in the cache"""
+
+    if renderer not in ("canvas", "raster"):
+        raise ValueError(f"no renderer named '{renderer}'")
+    if initial not in ("auto", "cached", "multilevel", "random"):
+        raise ValueError(f"no initial layout named '{initial}'")
+    cache = layout.default_cache if cache is None else cache
+
+    # tkinter initialization
+    root = tk.Tk()
+    canvas = tk.Canvas(root, width = screen_width, height = screen_height, bg = colour_background)
+    canvas.pack()
+
+    # initialize data
+    edges = get_edges(graph)
+
+    position = cache.get(layout.fingerprint(graph)) if initial == "auto" else None
+    if initial == "cached":
+        position = layout.cached_layout(graph, cache = cache)
+    elif initial == "multilevel":
+        position = layout.multilevel_layout(graph)
+    elif position is None:
+        position = random_position(graph.order)
+    velocity = np.zeros((graph.order, 2))
+    cell = layout.repulsion_cell(graph.order, screen_width, screen_height)
+
+    selected_vertex = None
+
+    # create canvas objects
+    vertices = []
+    labels = []
+    lines = []
+
+    arrow = tk.LAST if isinstance(graph, SuccessorGraph) or graph.directed else None
+    raster = None
+    image = None
+
+    if renderer == "raster":
+        raster = Raster(screen_width, screen_height, colour_background)
+        image = tk.PhotoImage(width = screen_width, height = screen_height)
+        canvas.create_image(0, 0, image = image, anchor = tk.NW)
+    else:
+        for i in range(len(edges)):
+            lines.append(canvas.create_line(0, 0, 0, 0, fill = colour_edge, width = edge_thickness, arrow = arrow))
+
+        for i in range(graph.order):
+            vertices.append(canvas.create_oval(0, 0, 0, 0, fill = colour_vertex, outline = colour_vertex_outline,
+                                               width = outline_thickness))
+            labels.append(canvas.create_text(0, 0, text = str(i), font = ("Arial", node_radius * 4 // 5, "bold"),
+                                             fill = colour_foreground))
+
+    # UPDATE
+    def update() -> None:
+        """apply physics calculations each frame"""
+
+        nonlocal position, velocity
+
+        position, velocity = step(position, velocity, edges, selected_vertex, cell = cell)
 
         # update graph
-        for i, ((x1, y1), (x2, y2)) in enumerate(line_pos):
-            canvas.coords(lines[i], x1, y1, x2, y2)
+        if raster is not None:
+            render(raster, position, edges, arrow is not None, selected_vertex)
+            image.configure(data = raster.to_ppm(), format = "PPM")
+        else:
+            for i, ((x1, y1), (x2, y2)) in enumerate(edge_segments(position, edges)):
+                canvas.coords(lines[i], x1, y1, x2, y2)
 
-        for i, (x, y) in enumerate(position):
-            canvas.coords(vertices[i], x - node_radius, y - node_radius, x + node_radius, y + node_radius)
-            canvas.coords(labels[i], x, y)
+            for i, (x, y) in enumerate(position):
+                canvas.coords(vertices[i], x - node_radius, y - node_radius, x + node_radius, y + node_radius)
+                canvas.coords(labels[i], x, y)
 
         root.after(1000 // target_fps, update)
 
@@ -190,7 +362,7 @@ def display(graph: Graph | SuccessorGraph) -> None:
                 minimum_index = i
 
         selected_vertex = minimum_index
-        if selected_vertex is not None:
+        if selected_vertex is not None and vertices:
             canvas.itemconfig(vertices[selected_vertex], outline = colour_vertex_highlight)
 
     def deselect_vertex(event) -> None:
@@ -198,7 +370,7 @@ def display(graph: Graph | SuccessorGraph) -> None:
 
         nonlocal selected_vertex
 
-        if selected_vertex is not None:
+        if selected_vertex is not None and vertices:
             canvas.itemconfig(vertices[selected_vertex], outline = colour_vertex_outline)
         selected_vertex = None
 
@@ -215,4 +387,6 @@ def display(graph: Graph | SuccessorGraph) -> None:
 
     # MAINLOOP
     update()
-    tk.mainloop()
\ No newline at end of file
+    tk.mainloop()
+
+    cache.put(layout.fingerprint(graph), position)
\ No newline at end of file
@@ -0,0 +1,289 @@
+import inspect, json, marshal, sys, threading, time
+from collections import Counter
+from collections.abc import Callable
+from contextlib import contextmanager
+from functools import wraps
+
+from . import traversal, cycle
+from .graph import ListGraph, MatrixGraph, SuccessorGraph
+from .view import SubgraphView
+
+# INSTRUMENTATION
+# while at least one hook is registered, the kernels that bfs, dfs and has_cycle dispatch to
+# (and the mutating graph methods) are replaced by recording wrappers.
+# with no hooks, the original functions are in place, so disabled instrumentation costs nothing.
+# only the entry of a traversal is wrapped (never a recursive helper), so the usable recursion depth
+# is the same with and without instrumentation. the depth of a recursive helper is measured with a
+# profile function (sys.setprofile) for the duration of the call instead.
+# statistics that a kernel does not expose are recorded as None
+
+# kernels that run once per call: name -> public function
+entry_kernels = {traversal: {"_bfs_list": "bfs", "_bfs_matrix": "bfs", "_bfs_successor": "bfs",
+                             "_bfs_frozen": "bfs", "_bfs_view": "bfs",
+                             "_dfs_recursive": "dfs", "_dfs_frozen": "dfs", "_dfs_view": "dfs"},
+                 cycle: {"_has_cycle_undirected_search": "has_cycle", "_has_cycle_directed_search": "has_cycle",
+                         "_has_cycle_successor_search": "has_cycle", "has_cycle_frozen": "has_cycle",
+                         "_has_cycle_view_directed": "has_cycle", "_has_cycle_view_undirected": "has_cycle"}}
+
+# entries that run a recursive helper per graph variant: entry name -> [(variant, helper name)]
+recursive_kernels = {"_dfs_recursive": [(ListGraph, "_dfs_list"), (MatrixGraph, "_dfs_matrix"),
+                                        (SuccessorGraph, "_dfs_successor")],
+                     "_has_cycle_undirected_search": [(ListGraph, "_has_cycle_undirected_list"),
+                                                      (MatrixGraph, "_has_cycle_undirected_matrix")],
+                     "_has_cycle_directed_search": [(ListGraph, "_has_cycle_directed_list"),
+                                                    (MatrixGraph, "_has_cycle_directed_matrix")],
+                     "_has_cycle_successor_search": [(SuccessorGraph, "_has_cycle_successor_dfs")]}
+
+# frames the wrapper and the profile function add to the stack, the recursion limit is raised by this
+# much while the depth is measured
+profile_frames = 4
+
+mutations = ["add_vertex", "reset", "add_edge", "remove_edge", "move_edge", "set_weight", "clear"]
+
+_hooks: list[Callable[[dict], None]] = []
+_originals: dict[tuple[object, str], Callable] = {}
+_state = threading.local()
+
+
+# HOOK REGISTRY
+def add_hook(hook: Callable[[dict], None]) -> None:
+    """register a callable that receives a dict for every instrumented call and mutation"""
+
+    _hooks.append(hook)
+    if len(_hooks) == 1:
+        _install()
+
+
+def remove_hook(hook: Callable[[dict], None]) -> None:
+    """unregister a hook, the original functions are restored once no hooks are left"""
+
+    _hooks.remove(hook)
+    if not _hooks:
+        _uninstall()
+
+
+def enabled() -> bool:
+    """returns whether instrumentation is currently active"""
+
+    return bool(_hooks)
+
+
+def _emit(record: dict) -> None:
+    for hook in list(_hooks):
+        hook(record)
+
+
+# STATISTICS
+def _degree(graph, v: int) -> int:
+    """helper function that returns how many adjacency entries a kernel scans for a vertex"""
+
+    if isinstance(graph, ListGraph):
+        return len(graph.adj[v])
+    if isinstance(graph, MatrixGraph):
+        return graph.order
+    if isinstance(graph, SuccessorGraph):
+        return int(graph.adj[v] is not None)
+    if isinstance(graph, SubgraphView):
+        return _degree(graph.graph, v)
+    return int(graph.offsets[v + 1] - graph.offsets[v])
+
+
+def _bfs_statistics(graph, dist) -> dict:
+    """helper function that derives traversal statistics from a bfs distance array"""
+
+    dist = dist.tolist() if hasattr(dist, "tolist") else dist
+    levels = Counter(d for d in dist if d != -1)
+    reached = [v for v, d in enumerate(dist) if d != -1]
+    return {"vertices_visited": len(reached),
+            "edges_scanned": sum(_degree(graph, v) for v in reached),
+            "max_depth": max(levels) if levels else 0,
+            "max_frontier": max(levels.values()) if levels else 0}
+
+
+def _reach_statistics(graph, visited) -> dict:
+    """helper function that derives traversal statistics from a reachability array"""
+
+    visited = visited.tolist() if hasattr(visited, "tolist") else visited
+    reached = [v for v, seen in enumerate(visited) if seen]
+    return {"vertices_visited": len(reached), "edges_scanned": sum(_degree(graph, v) for v in reached)}
+
+
+class _DepthProfiler:
+    """a profile function that tracks how deeply one function is nested in itself"""
+
+    def __init__(self, code) -> None:
+        self.code = code
+        self.depth = 0
+        self.max_depth = 0
+
+    def __call__(self, frame, event: str, arg) -> None:
+        if frame.f_code is self.code:
+            if event == "call":
+                self.depth += 1
+                self.max_depth = max(self.max_depth, self.depth)
+            elif event == "return":
+                self.depth -= 1
+
+
+def _helper(name: str, graph) -> str:
+    """helper function that returns the name of the recursive helper an entry runs for a graph (or the entry itself)"""
+
+    for variant, helper in recursive_kernels.get(name, []):
+        if isinstance(graph, variant):
+            return helper
+    return name
+
+
+# WRAPPERS
+def _open(function: str, path: str, graph) -> dict:
+    record = {"event": "call", "function": function, "path": path, "graph": type(graph).__name__,
+              "order": int(graph.order), "size": int(graph.size), "vertices_visited": 0, "edges_scanned": 0,
+              "max_depth": None, "max_frontier": None, "time": 0.0}
+    _state.record = record
+    return record
+
+
+def _wrap_entry(original: Callable, module, name: str, function: str) -> Callable:
+    @wraps(original)
+    def wrapper(graph, *args, **kwargs):
+        if getattr(_state, "record", None) is not None:
+            return original(graph, *args, **kwargs)
+
+        helper = _helper(name, graph)
+        record = _open(function, helper, graph)
+
+        # measure the recursion depth, unless another profiler (e.g. cProfile) is active
+        profiler, limit = None, sys.getrecursionlimit()
+        if helper != name and sys.getprofile() is None:
+            profiler = _DepthProfiler(inspect.unwrap(getattr(module, helper)).__code__)
+            sys.setrecursionlimit(limit + profile_frames)
+            sys.setprofile(profiler)
+
+        start = time.perf_counter()
+        try:
+            result = original(graph, *args, **kwargs)
+        finally:
+            record["time"] = time.perf_counter() - start
+            if profiler is not None:
+                sys.setprofile(None)
+                sys.setrecursionlimit(limit)
+                record["max_depth"] = profiler.max_depth
+            _state.record = None
+
+        if name.startswith("_bfs"):
+            record.update(_bfs_statistics(graph, result))
+        elif name.startswith("_dfs"):
+            record.update(_reach_statistics(graph, result))
+        elif name == "has_cycle_frozen":
+            # the vectorized kernels pass over every vertex and edge
+            record.update({"vertices_visited": int(graph.order), "edges_scanned": len(graph.targets)})
+        else:
+            # the has_cycle searches fill the visited list they are given
+            record.update(_reach_statistics(graph, args[0]))
+        _emit(record)
+        return result
+
+    return wrapper
+
+
+def _wrap_mutation(original: Callable, name: str) -> Callable:
+    @wraps(original)
+    def wrapper(self, *args, **kwargs):
+        # mutations made by another mutation (add_edge expanding with add_vertex) are not counted again
+        if getattr(_state, "mutating", False):
+            return original(self, *args, **kwargs)
+
+        _emit({"event": "mutation", "function": f"{type(self).__name__}.{name}"})
+        _state.mutating = True
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            _state.mutating = False
+
+    return wrapper
+
+
+def _install() -> None:
+    for module, kernels in entry_kernels.items():
+        for name, function in kernels.items():
+            _originals[(module, name)] = getattr(module, name)
+            setattr(module, name, _wrap_entry(getattr(module, name), module, name, function))
+
+    for cls in (ListGraph, MatrixGraph, SuccessorGraph):
+        for name in mutations:
+            if name in vars(cls):
+                _originals[(cls, name)] = vars(cls)[name]
+                setattr(cls, name, _wrap_mutation(vars(cls)[name], name))
+
+
+def _uninstall() -> None:
+    for (owner, name), original in _originals.items():
+        setattr(owner, name, original)
+    _originals.clear()
+
+
+# RECORDER
+class Recorder:
+    """a hook that collects call records and counts mutations"""
+
+    def __init__(self) -> None:
+        self.records: list[dict] = []
+        self.mutations: Counter = Counter()
+
+    def __call__(self, record: dict) -> None:
+        if record["event"] == "mutation":
+            self.mutations[record["function"]] += 1
+        else:
+            self.records.append(record)
+
+    def summary(self) -> dict[str, dict]:
+        """returns the call count, total time, vertices visited and edges scanned of every dispatch path"""
+
+        result = {}
+        for record in self.records:
+            entry = result.setdefault(record["path"], {"function": record["function"], "calls": 0, "time": 0.0,
+                                                       "vertices_visited": 0, "edges_scanned": 0})
+            entry["calls"] += 1
+            entry["time"] += record["time"]
+            entry["vertices_visited"] += record["vertices_visited"]
+            entry["edges_scanned"] += record["edges_scanned"]
+        return result
+
+    def to_json(self, path: str | None = None) -> str:
+        """returns (and optionally writes) the records, mutation counts and summary as json"""
+
+        data = json.dumps({"records": self.records, "mutations": dict(self.mutations),
+                           "summary": self.summary()}, indent = 2)
+        if path is not None:
+            with open(path, "w") as file:
+                file.write(data)
+        return data
+
+    def dump_stats(self, path: str) -> None:
+        """write the per-path timings in the marshal format of cProfile, readable with pstats.Stats(path)"""
+
+        stats = {}
+        for name, entry in self.summary().items():
+            module = traversal if entry["function"] in ("bfs", "dfs") else cycle
+            code = inspect.unwrap(getattr(module, name)).__code__
+            key = (code.co_filename, code.co_firstlineno, name)
+            stats[key] = (entry["calls"], entry["calls"], entry["time"], entry["time"], {})
+
+        with open(path, "wb") as file:
+            marshal.dump(stats, file)
+
+
+@contextmanager
+def profile():
+    """instrument every bfs, dfs and has_cycle call (and graph mutation) inside the block
+
+    with cc3.instrument.profile() as recorder:
+        cc3.bfs(graph)
+    print(recorder.summary())"""
+
+    recorder = Recorder()
+    add_hook(recorder)
+    try:
+        yield recorder
+    finally:
+        remove_hook(recorder)
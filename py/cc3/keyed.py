@@ -0,0 +1,239 @@
+from collections.abc import Hashable, Iterable, Iterator, Sequence
+from operator import itemgetter
+from typing import Any
+
+import numpy as np
+
+from .graph import Graph, ListGraph, MatrixGraph, SuccessorGraph
+from .traversal import bfs, dfs
+from .cycle import has_cycle
+
+
+class KeyedGraph:
+    """a graph whose vertices are arbitrary hashable keys (strings, tuples, ...)
+
+    every key is interned once into a dense integer id, and the edges live in an ordinary
+    integer-indexed graph (self.graph), so every cc3 algorithm runs on it at full speed.
+    ids are handed out in insertion order, self.keys[id] is the key of an id"""
+
+    def __init__(self, variant = "list", weighted = False, directed = False, default_value: Any = None) -> None:
+        if variant == "list":
+            self.graph = ListGraph(0, weighted, directed)
+        elif variant == "matrix":
+            self.graph = MatrixGraph(0, weighted, directed, default_value)
+        elif variant == "successor":
+            self.graph = SuccessorGraph(0, weighted)
+        else:
+            raise TypeError(f"no graph variant named '{variant}'")
+
+        self.ids: dict[Hashable, int] = {}
+        self.keys: list[Hashable] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.ids
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.keys)
+
+    def __str__(self) -> str:
+        result = ""
+        for key, v in self.ids.items():
+            result += f"{key!r} | " + ' '.join(repr(self.keys[w]) for w in self._successors(v)) + '\n'
+        return result.strip()
+
+    @property
+    def order(self) -> int:
+        return self.graph.order
+
+    @property
+    def size(self) -> int:
+        return self.graph.size
+
+    @property
+    def version(self) -> int:
+        return self.graph.version
+
+    # INTERNING
+    def add_node(self, key: Hashable) -> int:
+        """add a vertex for a key (if it does not exist yet), returns its id"""
+
+        v = self.ids.get(key)
+        if v is None:
+            v = self.ids[key] = len(self.keys)
+            self.keys.append(key)
+            self.graph.add_vertex()
+        return v
+
+    def add_nodes(self, keys: Iterable[Hashable]) -> np.ndarray:
+        """add a vertex for every new key, returns the ids of all keys.
+
+        the graph is grown once for the whole batch"""
+
+        ids = self.ids
+        start = len(self.keys)
+        result = []
+        for key in keys:
+            v = ids.get(key)
+            if v is None:
+                v = ids[key] = len(self.keys)
+                self.keys.append(key)
+            result.append(v)
+
+        if len(self.keys) > start:
+            self.graph.add_vertex(len(self.keys) - start)
+        return np.array(result, dtype = np.int64)
+
+    def id(self, key: Hashable) -> int:
+        """returns the id of a key"""
+
+        try:
+            return self.ids[key]
+        except KeyError:
+            raise IndexError(f"node ({key!r}) does not exist in graph") from None
+
+    def key(self, v: int) -> Hashable:
+        """returns the key of an id"""
+
+        if not 0 <= v < len(self.keys):
+            raise IndexError(f"vertex ({v}) does not exist in graph")
+        return self.keys[v]
+
+    def to_ids(self, keys: Sequence[Hashable], missing: int | None = None) -> np.ndarray:
+        """translate a batch of keys to an array of ids
+
+        unknown keys raise an IndexError, unless missing is given, which is then used as their id"""
+
+        if missing is not None:
+            get = self.ids.get
+            return np.fromiter((get(key, missing) for key in keys), dtype = np.int64, count = len(keys))
+        if not len(keys):
+            return np.zeros(0, dtype = np.int64)
+
+        try:
+            result = itemgetter(*keys)(self.ids)
+        except KeyError as error:
+            raise IndexError(f"node ({error.args[0]!r}) does not exist in graph") from None
+        return np.array(result if len(keys) > 1 else [result], dtype = np.int64)
+
+    def to_keys(self, ids: Sequence[int] | np.ndarray) -> list[Hashable]:
+        """translate a batch of ids back to their keys"""
+
+        ids = np.asarray(ids, dtype = np.int64)
+        if len(ids) and (ids.min() < 0 or ids.max() >= len(self.keys)):
+            raise IndexError("ids must refer to existing vertices")
+        if len(ids) == 1:
+            return [self.keys[int(ids[0])]]
+        return list(itemgetter(*ids.tolist())(self.keys)) if len(ids) else []
+
+    # VERTEX ACCESS
+    def _successors(self, v: int) -> list[int]:
+        """helper function that returns the ids of the outgoing neighbours of an id"""
+
+        graph = self.graph
+        if isinstance(graph, ListGraph):
+            return [e.dest for e in graph.adj[v]]
+        if isinstance(graph, MatrixGraph):
+            return graph.get_outgoing(v)
+        e = graph.adj[v]
+        return [] if e is None else [e.dest]
+
+    def successors(self, key: Hashable) -> list[Hashable]:
+        """returns the keys of the outgoing neighbours of a node"""
+
+        return [self.keys[w] for w in self._successors(self.id(key))]
+
+    def predecessors(self, key: Hashable) -> list[Hashable]:
+        """returns the keys of the incoming neighbours of a node"""
+
+        v = self.id(key)
+        return [self.keys[u] for u in range(self.graph.order) if v in self._successors(u)]
+
+    def out_degree(self, key: Hashable) -> int:
+        return self.graph.out_degree(self.id(key))
+
+    def in_degree(self, key: Hashable) -> int:
+        return self.graph.in_degree(self.id(key))
+
+    def degree(self, key: Hashable) -> int:
+        return self.graph.degree(self.id(key))
+
+    # EDGE ACCESS
+    def is_edge(self, a: Hashable, b: Hashable) -> bool:
+        if a not in self.ids or b not in self.ids:
+            return False
+        return self.graph.is_edge(self.ids[a], self.ids[b])
+
+    def is_edges(self, a: Sequence[Hashable], b: Sequence[Hashable]) -> np.ndarray:
+        """returns for every pair of keys (a[i], b[i]) whether there is an edge between them"""
+
+        sources = self.to_ids(a, missing = -1).tolist()
+        targets = self.to_ids(b, missing = -1).tolist()
+        is_edge = self.graph.is_edge
+        return np.fromiter((is_edge(u, v) for u, v in zip(sources, targets)), dtype = bool, count = len(sources))
+
+    def get_weight(self, a: Hashable, b: Hashable) -> Any:
+        return self.graph.get_weight(self.id(a), self.id(b))
+
+    # EDGE CONTROL
+    def add_edge(self, a: Hashable, b: Hashable, w: Any = 1) -> None:
+        """insert an edge between the nodes (a) and (b), adding the nodes if they do not exist"""
+
+        u = self.add_node(a)
+        v = self.add_node(b)
+        self.graph.add_edge(u, v, w, auto_expand = False)
+
+    def add_edges(self, edges: Iterable[tuple[Hashable, Hashable] | tuple[Hashable, Hashable, Any]]) -> None:
+        """insert a batch of (a, b) or (a, b, w) edges, interning all new nodes at once"""
+
+        edges = list(edges)
+        ends = self.add_nodes(key for edge in edges for key in edge[:2]).tolist()
+        add_edge = self.graph.add_edge
+        for i, edge in enumerate(edges):
+            add_edge(ends[2 * i], ends[2 * i + 1], edge[2] if len(edge) > 2 else 1, auto_expand = False)
+
+    def remove_edge(self, a: Hashable, b: Hashable) -> None:
+        self.graph.remove_edge(self.id(a), self.id(b))
+
+    def set_weight(self, a: Hashable, b: Hashable, w: Any = 1) -> None:
+        self.graph.set_weight(self.id(a), self.id(b), w)
+
+    def clear(self) -> None:
+        """clears all edges in the graph (the nodes are kept)"""
+
+        self.graph.clear()
+
+    # ALGORITHMS
+    def bfs(self, anchor: Hashable) -> dict[Hashable, int]:
+        """returns the distance of every node reachable from the anchor node"""
+
+        dist = bfs(self.graph, self.id(anchor))
+        return {self.keys[v]: d for v, d in enumerate(list(dist)) if d != -1}
+
+    def dfs(self, anchor: Hashable) -> set[Hashable]:
+        """returns the set of nodes reachable from the anchor node"""
+
+        visited = dfs(self.graph, self.id(anchor))
+        return {self.keys[v] for v, seen in enumerate(list(visited)) if seen}
+
+    def has_cycle(self) -> bool:
+        return has_cycle(self.graph)
+
+
+def from_graph(graph: Graph | SuccessorGraph, keys: Sequence[Hashable]) -> KeyedGraph:
+    """wrap an existing integer-indexed graph, vertex v gets the key keys[v]
+
+    NOTE: the graph is not copied"""
+
+    if len(keys) != graph.order:
+        raise ValueError("there must be exactly one key per vertex")
+
+    result = KeyedGraph()
+    result.graph = graph
+    result.keys = list(keys)
+    result.ids = {key: v for v, key in enumerate(result.keys)}
+    if len(result.ids) != len(result.keys):
+        raise ValueError("keys must be unique")
+    return result
@@ -0,0 +1,187 @@
+import numpy as np
+import hashlib, os
+
+from .graph import Graph, SuccessorGraph
+from . import graphics
+
+
+def _frame(width: int | None, height: int | None) -> tuple[int, int]:
+    """helper function that fills in the default frame dimensions"""
+
+    return (graphics.screen_width if width is None else width,
+            graphics.screen_height if height is None else height)
+
+
+# FINGERPRINT
+def fingerprint(graph: Graph | SuccessorGraph, width: int | None = None, height: int | None = None) -> str:
+    """returns a hash identifying the structure of a graph (and the frame it is laid out in)
+
+    two graphs with the same variant, order, direction and edges share a fingerprint"""
+
+    width, height = _frame(width, height)
+
+    edges = graphics.get_edges(graph)
+    if len(edges):
+        edges = edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+
+    directed = isinstance(graph, SuccessorGraph) or graph.directed
+    digest = hashlib.sha1(f"{type(graph).__name__}:{graph.order}:{directed}:{width}x{height}:".encode())
+    digest.update(np.ascontiguousarray(edges, dtype = np.int64).tobytes())
+    return digest.hexdigest()
+
+
+class LayoutCache:
+    """stores converged vertex positions by graph fingerprint
+
+    if a directory is given, positions are also written to disk so they survive between sessions"""
+
+    def __init__(self, directory: str | None = None) -> None:
+        self.directory = directory
+        self.positions: dict[str, np.ndarray] = {}
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok = True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".npy")
+
+    def get(self, key: str) -> np.ndarray | None:
+        """returns a copy of the cached positions, or None if there is no entry"""
+
+        if key not in self.positions and self.directory is not None and os.path.exists(self._path(key)):
+            self.positions[key] = np.load(self._path(key))
+
+        if key in self.positions:
+            return self.positions[key].copy()
+        return None
+
+    def put(self, key: str, position: np.ndarray) -> None:
+        """store positions under a fingerprint"""
+
+        self.positions[key] = np.array(position, dtype = np.float64)
+        if self.directory is not None:
+            np.save(self._path(key), self.positions[key])
+
+    def clear(self) -> None:
+        """remove every in-memory entry (files on disk are kept)"""
+
+        self.positions.clear()
+
+
+default_cache = LayoutCache()
+
+
+# COARSENING
+def _coarsen(order: int, edges: np.ndarray, rng: np.random.Generator) -> tuple[np.ndarray, int]:
+    """helper function that collapses a random maximal matching of the edges
+
+    returns the coarse vertex of every vertex and the amount of coarse vertices"""
+
+    match = [-1] * order
+    for a, b in edges[rng.permutation(len(edges))].tolist():
+        if a != b and match[a] == -1 and match[b] == -1:
+            match[a] = b
+            match[b] = a
+
+    mapping = [-1] * order
+    count = 0
+    for v in range(order):
+        if mapping[v] == -1:
+            mapping[v] = count
+            if match[v] != -1:
+                mapping[match[v]] = count
+            count += 1
+
+    return np.array(mapping, dtype = np.int64), count
+
+
+def _coarse_edges(edges: np.ndarray, mapping: np.ndarray) -> np.ndarray:
+    """helper function that maps edges onto the coarse graph, dropping loops and duplicates"""
+
+    coarse = mapping[edges]
+    coarse = coarse[coarse[:, 0] != coarse[:, 1]]
+    if len(coarse) == 0:
+        return coarse.reshape(-1, 2)
+    return np.unique(np.sort(coarse, axis = 1), axis = 0)
+
+
+# LAYOUT
+# levels up to this order use the exact all-pairs repulsion, larger ones the grid approximation
+exact_order = 1000
+
+# average amount of vertices per grid cell in the approximation
+cell_occupancy = 8
+
+
+def repulsion_cell(order: int, width: int, height: int) -> float | None:
+    """returns the grid cell size for graphics.step on a graph of a given order (None for exact repulsion)
+
+    graphs with more than exact_order vertices only repel nearby vertices (see graphics.grid_repulsion),
+    with cells sized so that a cell holds about cell_occupancy vertices"""
+
+    if order <= exact_order:
+        return None
+    return min(max(np.sqrt(width * height * cell_occupancy / order), 1.0), 2 * graphics.spring_length)
+
+
+def multilevel_layout(graph: Graph | SuccessorGraph, width: int | None = None, height: int | None = None,
+                      iterations = 100, refinement = 30, min_order = 16, seed: int | None = None,
+                      position: np.ndarray | None = None) -> np.ndarray:
+    """compute vertex positions by repeatedly coarsening the graph with matchings,
+    laying out the smallest graph, then prolonging and refining level by level
+
+    if a position array is given, it is only refined (warm start) instead of being computed from scratch"""
+
+    width, height = _frame(width, height)
+    rng = np.random.default_rng(seed)
+    edges = graphics.get_edges(graph)
+
+    if position is not None:
+        return _refine(np.asarray(position, dtype = np.float64), edges, refinement, width, height)
+
+    # build the hierarchy
+    levels = [(graph.order, edges, None)]
+    while levels[-1][0] > min_order:
+        order, level_edges, _ = levels[-1]
+        mapping, coarse_order = _coarsen(order, level_edges, rng)
+        if coarse_order > 0.9 * order:
+            break
+        levels.append((coarse_order, _coarse_edges(level_edges, mapping), mapping))
+
+    # lay out the coarsest graph
+    order, level_edges, _ = levels[-1]
+    position = np.column_stack([rng.uniform(10, width - 10, order), rng.uniform(10, height - 10, order)])
+    position = _refine(position, level_edges, iterations, width, height)
+
+    # prolong back to the original graph
+    for i in range(len(levels) - 1, 0, -1):
+        mapping = levels[i][2]
+        finer_order, finer_edges, _ = levels[i - 1]
+        position = position[mapping] + rng.normal(0, graphics.node_radius, (finer_order, 2))
+        position = _refine(position, finer_edges, refinement, width, height)
+
+    return position
+
+
+def _refine(position: np.ndarray, edges: np.ndarray, iterations: int, width: int, height: int) -> np.ndarray:
+    """helper function that runs the force simulation on positions for a number of steps"""
+
+    cell = repulsion_cell(len(position), width, height)
+    velocity = np.zeros_like(position)
+    for _ in range(iterations):
+        position, velocity = graphics.step(position, velocity, edges, width = width, height = height, cell = cell)
+    return position
+
+
+def cached_layout(graph: Graph | SuccessorGraph, width: int | None = None, height: int | None = None,
+                  cache: LayoutCache | None = None, seed: int | None = None) -> np.ndarray:
+    """returns the cached positions of a graph, computing (and caching) a multilevel layout on a miss"""
+
+    cache = default_cache if cache is None else cache
+    key = fingerprint(graph, width, height)
+
+    position = cache.get(key)
+    if position is None:
+        position = multilevel_layout(graph, width, height, seed = seed)
+        cache.put(key, position)
+    return position
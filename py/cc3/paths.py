@@ -0,0 +1,178 @@
+import numpy as np
+
+from .graph import Graph, MatrixGraph, SuccessorGraph
+from .frozen import FrozenGraph, freeze
+
+# ALL-PAIRS SHORTEST PATHS
+# distances are float64 matrices, dist[a, b] is the length of the shortest path from (a) to (b)
+# (np.inf if there is none). unweighted graphs count every edge as 1
+
+# the blocked variant of floyd_warshall updates tiles of this many rows and columns at a time
+block_size = 128
+
+# below this density (stored edges / order²), all_pairs uses repeated bfs on unweighted graphs
+bfs_density = 0.05
+
+
+def weight_matrix(graph: Graph | SuccessorGraph | FrozenGraph) -> np.ndarray:
+    """returns the edge weights of a graph as a float64 matrix, np.inf where there is no edge
+
+    for a MatrixGraph, cells equal to its default_value are the missing edges"""
+
+    if isinstance(graph, MatrixGraph):
+        try:
+            weights = np.array(graph.adj, dtype = np.float64).reshape(graph.order, graph.order)
+        except (TypeError, ValueError):
+            raise TypeError("only numeric edge weights can be used for shortest paths") from None
+
+        # None cells become nan in a float array
+        missing = np.isnan(weights) if graph.default_value is None else weights == graph.default_value
+        if not graph.weighted:
+            weights[:] = 1
+        weights[missing] = np.inf
+        return weights
+
+    frozen = freeze(graph)
+    weights = np.full((frozen.order, frozen.order), np.inf)
+    if frozen.weighted and frozen.weights is not None:
+        weights[frozen.sources(), frozen.targets] = frozen.weights
+    else:
+        weights[frozen.sources(), frozen.targets] = 1
+    return weights
+
+
+def _check_negative_cycle(dist: np.ndarray) -> np.ndarray:
+    if np.any(np.diagonal(dist) < 0):
+        raise ValueError("graph has a negative cycle, shortest paths are undefined")
+    return dist
+
+
+def floyd_warshall(graph: Graph | SuccessorGraph | FrozenGraph, blocked = False) -> np.ndarray:
+    """returns the all-pairs shortest path distances of a graph
+
+    every pivot vertex k is one vectorized rank-1 update dist = min(dist, dist[:, k] + dist[k, :]).
+    if blocked is True, the pivots are processed block_size at a time so every tile update works on
+    cache-sized sub-matrices (can be faster on large graphs, depending on block_size and the cpu cache).
+    raises a ValueError if the graph has a negative cycle"""
+
+    dist = weight_matrix(graph)
+    np.fill_diagonal(dist, np.minimum(np.diagonal(dist), 0))
+
+    if blocked:
+        _floyd_warshall_blocked(dist, block_size)
+    else:
+        for k in range(len(dist)):
+            np.minimum(dist, dist[:, k, None] + dist[None, k, :], out = dist)
+
+    return _check_negative_cycle(dist)
+
+
+def _relax(dist: np.ndarray, rows: slice, columns: slice, pivots: range) -> None:
+    """helper function that runs the pivots of one block over a tile of the distance matrix, in order"""
+
+    tile = dist[rows, columns]
+    for k in pivots:
+        np.minimum(tile, dist[rows, k, None] + dist[None, k, columns], out = tile)
+
+
+def _floyd_warshall_blocked(dist: np.ndarray, block: int) -> None:
+    """helper function of floyd_warshall that runs the three-phase blocked algorithm in place
+
+    for every diagonal block K: (1) close the block itself, (2) update the row and column panels
+    through K, (3) update every remaining tile with a min-plus product of its two panels"""
+
+    order = len(dist)
+    for start in range(0, order, block):
+        end = min(start + block, order)
+        pivots = range(start, end)
+        K = slice(start, end)
+
+        # (1) diagonal block
+        _relax(dist, K, K, pivots)
+
+        # (2) panels in the pivot rows and columns
+        _relax(dist, K, slice(0, order), pivots)
+        _relax(dist, slice(0, order), K, pivots)
+
+        # (3) remaining tiles, min-plus product of the finished panels
+        for i in range(0, order, block):
+            if i == start:
+                continue
+            rows = slice(i, min(i + block, order))
+            left = dist[rows, K]
+            for j in range(0, order, block):
+                if j == start:
+                    continue
+                columns = slice(j, min(j + block, order))
+                product = (left[:, :, None] + dist[None, K, columns]).min(axis = 1)
+                np.minimum(dist[rows, columns], product, out = dist[rows, columns])
+
+
+def bfs_all_pairs(graph: Graph | SuccessorGraph | FrozenGraph, sources: np.ndarray | None = None) -> np.ndarray:
+    """returns the edge count of the shortest path between every source and every vertex (-1 if unreachable)
+
+    edge weights are ignored. 64 sources are searched at once: every vertex keeps a 64-bit mask of
+    the sources that reached it and a whole bfs level is one pass over the edge arrays"""
+
+    frozen = freeze(graph, weights = False) if not isinstance(graph, FrozenGraph) else graph
+    order = frozen.order
+    sources = np.arange(order, dtype = np.int64) if sources is None else np.asarray(sources, dtype = np.int64)
+    if len(sources) and (sources.min() < 0 or sources.max() >= order):
+        raise IndexError("sources must be vertices of the graph")
+
+    # group the edges by destination, so a level is one reduceat over the frontier masks of their origins
+    targets = np.asarray(frozen.targets, dtype = np.int64)
+    by_target = np.argsort(targets, kind = "stable")
+    origins = frozen.sources()[by_target]
+    targets = targets[by_target]
+    heads = np.flatnonzero(np.concatenate([[True], targets[1:] != targets[:-1]])) if len(targets) else targets
+    receivers = targets[heads]
+
+    dist = np.full((len(sources), order), -1, dtype = np.int64)
+    for start in range(0, len(sources), 64):
+        batch = sources[start:start + 64]
+        rows = np.arange(start, start + len(batch))
+        dist[rows, batch] = 0
+
+        visited = np.zeros(order, dtype = np.uint64)
+        np.bitwise_or.at(visited, batch, np.left_shift(np.uint64(1), np.arange(len(batch), dtype = np.uint64)))
+        frontier = visited.copy()
+
+        depth = 0
+        while len(heads) and frontier.any():
+            depth += 1
+            reached = np.zeros(order, dtype = np.uint64)
+            reached[receivers] = np.bitwise_or.reduceat(frontier[origins], heads)
+            frontier = reached & ~visited
+            visited |= frontier
+
+            # unpack the new bits into (vertex, source) pairs
+            changed = np.flatnonzero(frontier)
+            bits = np.unpackbits(frontier[changed].astype("<u8").view(np.uint8).reshape(-1, 8),
+                                 axis = 1, bitorder = "little")
+            vertex, source = np.nonzero(bits)
+            dist[start + source, changed[vertex]] = depth
+
+    return dist
+
+
+def all_pairs(graph: Graph | SuccessorGraph | FrozenGraph, method = "auto") -> np.ndarray:
+    """returns the all-pairs shortest path distances of a graph as a float64 matrix (np.inf if unreachable)
+
+    method is one of "floyd_warshall", "blocked" (blocked floyd_warshall) or "bfs" (ignores weights).
+    "auto" uses bfs for sparse unweighted graphs and floyd_warshall otherwise"""
+
+    if method == "auto":
+        stored = graph.size if isinstance(graph, SuccessorGraph) or graph.directed else 2 * graph.size
+        sparse = stored < bfs_density * graph.order * graph.order
+        method = "bfs" if sparse and not graph.weighted else "floyd_warshall"
+
+    if method == "floyd_warshall":
+        return floyd_warshall(graph)
+    if method == "blocked":
+        return floyd_warshall(graph, blocked = True)
+    if method == "bfs":
+        hops = bfs_all_pairs(graph)
+        return np.where(hops == -1, np.inf, hops.astype(np.float64))
+
+    raise ValueError(f"no all-pairs method named '{method}'")
@@ -0,0 +1,203 @@
+import numpy as np
+import struct, zlib
+
+
+def hex_to_rgb(colour: str) -> np.ndarray:
+    """turns a tkinter style hex colour ("#rrggbb") into an rgb array"""
+
+    colour = colour.lstrip('#')
+    if len(colour) != 6:
+        raise ValueError(f"invalid colour '#{colour}'")
+    return np.array([int(colour[i:i + 2], 16) for i in (0, 2, 4)], dtype = np.uint8)
+
+
+def _disc_offsets(radius: int) -> np.ndarray:
+    """helper function that returns the pixel offsets covered by a disc of a given radius"""
+
+    r = max(int(radius), 0)
+    y, x = np.mgrid[-r:r + 1, -r:r + 1]
+    inside = x * x + y * y <= r * r
+    return np.stack([x[inside], y[inside]], axis = 1)
+
+
+def _clip(segments: np.ndarray, left: float, right: float, top: float, bottom: float) -> np.ndarray:
+    """helper function that cuts line segments of shape (k, 2, 2) to a rectangle (Liang-Barsky),
+    segments entirely outside of it are dropped"""
+
+    start, delta = segments[:, 0], segments[:, 1] - segments[:, 0]
+    low = np.zeros(len(segments))
+    high = np.ones(len(segments))
+    keep = np.ones(len(segments), dtype = bool)
+
+    for p, q in ((-delta[:, 0], start[:, 0] - left), (delta[:, 0], right - start[:, 0]),
+                 (-delta[:, 1], start[:, 1] - top), (delta[:, 1], bottom - start[:, 1])):
+        parallel = p == 0
+        keep &= ~(parallel & (q < 0))
+        with np.errstate(divide = "ignore", invalid = "ignore"):
+            r = q / p
+        low = np.where(~parallel & (p < 0), np.maximum(low, r), low)
+        high = np.where(~parallel & (p > 0), np.minimum(high, r), high)
+
+    keep &= low <= high
+    start, delta, low, high = start[keep], delta[keep], low[keep], high[keep]
+    return np.stack([start + delta * low[:, np.newaxis], start + delta * high[:, np.newaxis]], axis = 1)
+
+
+# pixel samples drawn at once by Raster.draw_lines, bounds its memory use
+line_samples = 1 << 20
+
+
+class Raster:
+    """an off-screen rgb image buffer that vertices and edges can be drawn on in bulk
+
+    every drawing method is vectorized over all shapes at once,
+    so the cost of a frame does not depend on the amount of tkinter canvas items"""
+
+    def __init__(self, width: int, height: int, background = "#ffffff") -> None:
+        if width <= 0 or height <= 0:
+            raise ValueError("raster dimensions must be positive")
+
+        self.width = width
+        self.height = height
+        self.background = hex_to_rgb(background)
+        self.buffer = np.empty((height, width, 3), dtype = np.uint8)
+        self.clear()
+
+    def clear(self) -> None:
+        """fill the whole buffer with the background colour"""
+
+        self.buffer[:, :] = self.background
+
+    def _marks(self, pad: int) -> np.ndarray:
+        """helper function that returns an empty coverage mask of the buffer with a border of pad pixels"""
+
+        return np.zeros((self.height + 2 * pad, self.width + 2 * pad), dtype = bool)
+
+    def _mark(self, points: np.ndarray, marked: np.ndarray, pad: int) -> None:
+        """helper function that marks the pixel of every (x, y) point in a coverage mask (see _marks)"""
+
+        x = np.rint(points[:, 0]).astype(np.int64) + pad
+        y = np.rint(points[:, 1]).astype(np.int64) + pad
+        inside = (x >= 0) & (x < marked.shape[1]) & (y >= 0) & (y < marked.shape[0])
+        marked[y[inside], x[inside]] = True
+
+    def _paint(self, marked: np.ndarray, pad: int, offsets: np.ndarray, colour: np.ndarray) -> None:
+        """helper function that colours every pixel within the offsets of a marked pixel
+
+        the offsets are applied as shifted slices of the mask, so repeated pixels cost nothing
+        and the buffer is written once"""
+
+        covered = np.zeros((self.height, self.width), dtype = bool)
+        for dx, dy in offsets.tolist():
+            covered |= marked[pad - dy:pad - dy + self.height, pad - dx:pad - dx + self.width]
+        self.buffer[covered] = colour
+
+    def _plot(self, points: np.ndarray, colour: np.ndarray, offsets: np.ndarray) -> None:
+        """helper function that colours the pixel of every (x, y) point, shifted by every offset, inside the buffer"""
+
+        pad = int(np.abs(offsets).max()) if len(offsets) else 0
+        marked = self._marks(pad)
+        self._mark(points, marked, pad)
+        self._paint(marked, pad, offsets, colour)
+
+    def draw_lines(self, segments: np.ndarray, colour = "#000000", thickness = 1) -> None:
+        """draw line segments given as an array of shape (k, 2, 2)
+
+        segments are clipped to the buffer first, then sampled in batches of at most line_samples pixels"""
+
+        segments = np.asarray(segments, dtype = np.float64).reshape(-1, 2, 2)
+        pad = thickness // 2 + 1
+        segments = _clip(segments, -pad, self.width - 1 + pad, -pad, self.height - 1 + pad)
+        if len(segments) == 0:
+            return
+
+        offsets = _disc_offsets(thickness // 2 if thickness > 1 else 0)
+        marked = self._marks(pad)
+        start = segments[:, 0]
+        delta = segments[:, 1] - start
+        steps = np.ceil(np.abs(delta).max(axis = 1)).astype(np.int64) + 1
+        total = np.cumsum(steps)
+
+        batch = 0
+        while batch < len(segments):
+            # take as many segments as fit into one batch of samples
+            done = total[batch] - steps[batch]
+            stop = max(int(np.searchsorted(total, done + line_samples, "right")), batch + 1)
+
+            # sample every segment once per pixel along its longest axis
+            count = steps[batch:stop]
+            step = delta[batch:stop] / np.maximum(count - 1, 1)[:, np.newaxis]
+            index = np.arange(int(count.sum()), dtype = np.float64) - np.repeat(total[batch:stop] - count - done, count)
+            points = np.repeat(start[batch:stop], count, axis = 0)
+            points += np.repeat(step, count, axis = 0) * index[:, np.newaxis]
+            del step, index
+
+            self._mark(points, marked, pad)
+            batch = stop
+
+        # thickness is a disc of a few pixels around every sample
+        self._paint(marked, pad, offsets, hex_to_rgb(colour))
+
+    def draw_arrows(self, segments: np.ndarray, colour = "#000000", thickness = 1, length = 8.0) -> None:
+        """draw arrowheads at the end of line segments given as an array of shape (k, 2, 2)"""
+
+        segments = np.asarray(segments, dtype = np.float64).reshape(-1, 2, 2)
+        if len(segments) == 0:
+            return
+
+        tip = segments[:, 1]
+        delta = tip - segments[:, 0]
+        unit = delta / np.maximum(np.linalg.norm(delta, axis = 1), 1e-9)[:, np.newaxis]
+        normal = unit[:, ::-1] * np.array([-1.0, 1.0])
+
+        base = tip - unit * length
+        left = np.stack([base + normal * length / 2, tip], axis = 1)
+        right = np.stack([base - normal * length / 2, tip], axis = 1)
+        self.draw_lines(np.concatenate([left, right]), colour, thickness)
+
+    def draw_discs(self, centers: np.ndarray, radius: int, colour = "#000000",
+                   outline: str | None = None, outline_thickness = 0) -> None:
+        """draw filled discs (optionally outlined) at an array of centers with shape (n, 2)"""
+
+        centers = np.asarray(centers, dtype = np.float64).reshape(-1, 2)
+        if len(centers) == 0:
+            return
+
+        if outline is not None and outline_thickness > 0:
+            self._plot(centers, hex_to_rgb(outline), _disc_offsets(radius))
+            radius -= outline_thickness
+
+        self._plot(centers, hex_to_rgb(colour), _disc_offsets(radius))
+
+    # EXPORT
+    def to_ppm(self) -> bytes:
+        """returns the buffer encoded as a binary PPM (P6) image"""
+
+        return f"P6 {self.width} {self.height} 255\n".encode() + self.buffer.tobytes()
+
+    def to_png(self) -> bytes:
+        """returns the buffer encoded as a PNG image"""
+
+        def chunk(tag: bytes, data: bytes) -> bytes:
+            return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+
+        # every scanline starts with filter type 0 (none)
+        rows = np.zeros((self.height, self.width * 3 + 1), dtype = np.uint8)
+        rows[:, 1:] = self.buffer.reshape(self.height, -1)
+
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+        return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) +
+                chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)) + chunk(b"IEND", b""))
+
+    def save(self, path: str) -> None:
+        """write the buffer to disk, the format (.png or .ppm) is picked from the file extension"""
+
+        if path.lower().endswith(".png"):
+            data = self.to_png()
+        elif path.lower().endswith(".ppm"):
+            data = self.to_ppm()
+        else:
+            raise ValueError(f"unsupported image format for '{path}' (expected .png or .ppm)")
+
+        with open(path, "wb") as file:
+            file.write(data)
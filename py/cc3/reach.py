@@ -0,0 +1,130 @@
+import weakref
+import numpy as np
+
+from .graph import Graph, SuccessorGraph
+from .frozen import FrozenGraph
+from .dag import condensation
+from .traversal import bfs
+
+# largest closure (in bytes) a reachability index may allocate, reachable and reachable_set
+# answer queries on graphs with more components by traversal instead
+closure_limit = 1 << 30
+
+
+def closure_bytes(components: int) -> int:
+    """returns the size in bytes of the closure of a condensation with this many components"""
+
+    return components * ((components + 63) // 64) * 8
+
+
+class ReachabilityIndex:
+    """answers "can (a) reach (b)" for every pair of vertices without a traversal
+
+    the graph is condensed into its strongly connected components, and every component stores
+    the set of components it reaches as a row of 64-bit words (the transitive closure of the
+    condensation, built in reverse topological order). a query is one component lookup and one bit test.
+    memory: components² / 8 bytes, a ValueError is raised if that exceeds closure_limit
+
+    NOTE: the index describes the graph at the time it was built, see reachability_index"""
+
+    def __init__(self, graph: Graph | SuccessorGraph | FrozenGraph) -> None:
+        result = condensation(graph)
+        size = closure_bytes(len(result.components))
+        if size > closure_limit:
+            raise ValueError(f"the reachability index of {len(result.components)} components needs {size} bytes "
+                             f"(closure_limit is {closure_limit})")
+
+        self.version = graph.version
+        self.order = graph.order
+        self.component = np.array(result.component, dtype = np.int64)
+        self.components = len(result.components)
+
+        words = (self.components + 63) // 64
+        self.closure = np.zeros((self.components, words), dtype = np.uint64)
+        one = np.uint64(1)
+
+        # a component reaches itself and everything its successors reach,
+        # components are in topological order, so successors are always finished first
+        for c in range(self.components - 1, -1, -1):
+            row = self.closure[c]
+            row[c >> 6] |= one << np.uint64(c & 63)
+            for e in result.dag.adj[c]:
+                row |= self.closure[e.dest]
+
+    def _check(self, v: int) -> None:
+        if not 0 <= v < self.order:
+            raise IndexError(f"vertex ({v}) does not exist in graph")
+
+    def reachable(self, a: int, b: int) -> bool:
+        """returns whether vertex (b) can be reached from vertex (a)"""
+
+        self._check(a)
+        self._check(b)
+        c = int(self.component[b])
+        return bool((int(self.closure[self.component[a], c >> 6]) >> (c & 63)) & 1)
+
+    def reachable_mask(self, a: int) -> np.ndarray:
+        """returns an array indicating whether each vertex can be reached from vertex (a)
+
+        (the same result as dfs(graph, a))"""
+
+        self._check(a)
+        row = self.closure[self.component[a]].astype("<u8").view(np.uint8)
+        reached = np.unpackbits(row, bitorder = "little")[:self.components].astype(bool)
+        return reached[self.component]
+
+    def reachable_set(self, a: int) -> np.ndarray:
+        """returns the vertices that can be reached from vertex (a), in increasing order"""
+
+        return np.flatnonzero(self.reachable_mask(a))
+
+
+_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def reachability_index(graph: Graph | SuccessorGraph | FrozenGraph) -> ReachabilityIndex:
+    """returns the reachability index of a graph, cached until the graph is mutated"""
+
+    cached = _cache.get(graph)
+    if cached is not None and cached.version == graph.version:
+        return cached
+
+    result = ReachabilityIndex(graph)
+    _cache[graph] = result
+    return result
+
+
+def _indexed(graph: Graph | SuccessorGraph | FrozenGraph) -> bool:
+    """helper function that returns whether the reachability index of a graph fits in closure_limit"""
+
+    return closure_bytes(len(condensation(graph).components)) <= closure_limit
+
+
+def _check(graph: Graph | SuccessorGraph | FrozenGraph, v: int) -> None:
+    if not 0 <= v < graph.order:
+        raise IndexError(f"vertex ({v}) does not exist in graph")
+
+
+def reachable(graph: Graph | SuccessorGraph | FrozenGraph, a: int, b: int) -> bool:
+    """returns whether vertex (b) can be reached from vertex (a), using the cached reachability index
+
+    (or a search of the condensation, if the index would be larger than closure_limit)"""
+
+    if _indexed(graph):
+        return reachability_index(graph).reachable(a, b)
+
+    _check(graph, a)
+    _check(graph, b)
+    return condensation(graph).reaches(a, b)
+
+
+def reachable_set(graph: Graph | SuccessorGraph | FrozenGraph, a: int) -> np.ndarray:
+    """returns the vertices that can be reached from vertex (a), using the cached reachability index
+
+    (or a bfs, if the index would be larger than closure_limit)"""
+
+    if _indexed(graph):
+        return reachability_index(graph).reachable_set(a)
+
+    _check(graph, a)
+    return np.flatnonzero(np.asarray(bfs(graph, a)) != -1)
@@ -0,0 +1,126 @@
+from operator import itemgetter
+
+import numpy as np
+
+from .graph import Graph, Edge, ListGraph, MatrixGraph, SuccessorGraph
+from .frozen import freeze, from_edges
+
+# VERTEX REORDERING
+# a permutation maps new vertex indices to old ones (permutation[new] = old),
+# its inverse maps old indices to new ones (inverse[old] = new)
+
+
+def _symmetric(graph: Graph | SuccessorGraph) -> tuple[np.ndarray, np.ndarray]:
+    """helper function that returns the offsets and targets of the graph with every edge in both directions"""
+
+    frozen = freeze(graph, weights = False)
+    if not frozen.directed:
+        return np.asarray(frozen.offsets, dtype = np.int64), np.asarray(frozen.targets, dtype = np.int64)
+
+    symmetric = from_edges(frozen.order, frozen.sources(), frozen.targets, directed = False)
+    return symmetric.offsets, symmetric.targets
+
+
+def _bfs_order(offsets: np.ndarray, targets: np.ndarray, by_degree: bool) -> list[int]:
+    """helper function that lists the vertices in bfs order, one component after another
+
+    every component starts at its vertex of smallest degree. if by_degree is True, the neighbours
+    of a vertex are visited in increasing degree (Cuthill-McKee)"""
+
+    order = len(offsets) - 1
+    degree = np.diff(offsets)
+    if by_degree and len(targets):
+        # sort every row by the degree of its targets with one stable argsort on a combined key
+        sources = np.repeat(np.arange(order, dtype = np.int64), degree)
+        targets = targets[np.argsort(sources * (int(degree.max()) + 1) + degree[targets], kind = "stable")]
+
+    offsets, targets = offsets.tolist(), targets.tolist()
+    visited = [False] * order
+    result = []
+
+    for root in np.argsort(degree, kind = "stable").tolist():
+        if visited[root]:
+            continue
+        visited[root] = True
+        head = len(result)
+        result.append(root)
+
+        # result doubles as the bfs queue
+        while head < len(result):
+            current = result[head]
+            head += 1
+            for i in targets[offsets[current]:offsets[current + 1]]:
+                if not visited[i]:
+                    visited[i] = True
+                    result.append(i)
+
+    return result
+
+
+def permutation(graph: Graph | SuccessorGraph, method = "rcm") -> np.ndarray:
+    """returns a vertex order that improves the memory locality of traversals (permutation[new] = old)
+
+    method:
+        "rcm" - reverse Cuthill-McKee, bfs with neighbours in increasing degree, reversed (small bandwidth)
+        "bfs" - plain bfs order, so every bfs level is a contiguous range of indices
+        "degree" - decreasing degree, so the most visited vertices share the first rows
+    directed graphs are ordered by their underlying undirected graph"""
+
+    if method == "degree":
+        offsets, _ = _symmetric(graph)
+        return np.argsort(-np.diff(offsets), kind = "stable")
+    if method in ("rcm", "bfs"):
+        offsets, targets = _symmetric(graph)
+        result = np.array(_bfs_order(offsets, targets, method == "rcm"), dtype = np.int64)
+        return result[::-1].copy() if method == "rcm" else result
+
+    raise ValueError(f"no reordering method named '{method}'")
+
+
+def relabel(graph: Graph | SuccessorGraph, permutation: np.ndarray) -> Graph | SuccessorGraph:
+    """returns a copy of the graph where new vertex (v) is old vertex permutation[v]"""
+
+    permutation = np.asarray(permutation, dtype = np.int64)
+    if len(permutation) != graph.order or np.any(np.bincount(permutation, minlength = graph.order) != 1):
+        raise ValueError("permutation must contain every vertex exactly once")
+
+    old = permutation.tolist()
+    new = np.argsort(permutation).tolist()
+
+    if isinstance(graph, ListGraph):
+        result = ListGraph(graph.order, graph.weighted, graph.directed)
+        result.adj = [[Edge(v, new[e.dest], e.weight, result) for e in graph.adj[u]] for v, u in enumerate(old)]
+
+    elif isinstance(graph, MatrixGraph):
+        result = MatrixGraph(0, graph.weighted, graph.directed, graph.default_value)
+        result.order = graph.order
+        if graph.order <= 1:
+            result.adj = [list(n) for n in graph.adj]
+        else:
+            columns = itemgetter(*old)
+            result.adj = [list(columns(graph.adj[u])) for u in old]
+
+    elif isinstance(graph, SuccessorGraph):
+        result = SuccessorGraph(graph.order, graph.weighted)
+        for v, u in enumerate(old):
+            e = graph.adj[u]
+            if e is not None:
+                result.adj[v] = Edge(v, new[e.dest], e.weight, result)
+
+    else:
+        raise NotImplementedError(f"relabel not supported for '{type(graph).__name__}'")
+
+    result.size = graph.size
+    return result
+
+
+def reorder(graph: Graph | SuccessorGraph, method = "rcm") -> tuple[Graph | SuccessorGraph, np.ndarray, np.ndarray]:
+    """relabel the vertices of a graph for better memory locality during bfs/dfs
+
+    returns the relabelled graph, the permutation (permutation[new] = old) and its inverse (inverse[old] = new).
+    translate anchors with inverse[v] and results back with result[inverse] (see permutation for the methods)"""
+
+    order = permutation(graph, method)
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(len(order), dtype = np.int64)
+    return relabel(graph, order), order, inverse
@@ -0,0 +1,99 @@
+import numpy as np
+import struct
+
+from .graph import Graph, SuccessorGraph
+from .frozen import FrozenGraph, freeze
+
+# FILE LAYOUT
+# header (64 bytes) | offsets (int64, order + 1) | targets (int32/int64, arcs) | weights (int64/float64, arcs)
+# every array starts on an 8 byte boundary so that it can be memory-mapped in place
+magic = b"CC3G"
+format_version = 1
+header_format = "<4sHBBBBBxQQQd"
+header_length = 64
+
+variant_codes = {"list": 0, "matrix": 1, "successor": 2}
+index_types = {0: np.int32, 1: np.int64}
+weight_types = {0: None, 1: np.int64, 2: np.float64}
+
+flag_weighted = 1
+flag_directed = 2
+flag_default_none = 4
+
+
+def _align(n: int) -> int:
+    return (n + 7) // 8 * 8
+
+
+def save(graph: Graph | SuccessorGraph | FrozenGraph, path: str) -> None:
+    """write a graph to disk in cc3's binary format
+
+    NOTE: only numeric edge weights (and a numeric or None default_value) can be saved"""
+
+    frozen = freeze(graph)
+    offsets, targets, weights = frozen.get_data()
+
+    default = frozen.default_value
+    if default is not None and not isinstance(default, (int, float)):
+        raise TypeError("only numeric or None default values can be saved")
+
+    index_type = 0 if frozen.order < 2 ** 31 else 1
+    weight_type = 0 if weights is None else (1 if weights.dtype.kind == 'i' else 2)
+    flags = (flag_weighted * frozen.weighted | flag_directed * frozen.directed |
+             flag_default_none * (default is None))
+
+    header = struct.pack(header_format, magic, format_version, variant_codes[frozen.variant], flags,
+                         index_type, weight_type, 0, frozen.order, frozen.size, len(targets),
+                         0.0 if default is None else float(default))
+
+    with open(path, "wb") as file:
+        file.write(header.ljust(header_length, b"\0"))
+        for array, dtype in ((offsets, np.int64), (targets, index_types[index_type]),
+                             (weights, weight_types[weight_type])):
+            if dtype is None:
+                continue
+            data = np.ascontiguousarray(array, dtype = np.dtype(dtype).newbyteorder('<')).tobytes()
+            file.write(data.ljust(_align(len(data)), b"\0"))
+
+
+def load(path: str, mmap = True) -> FrozenGraph | Graph | SuccessorGraph:
+    """read a graph written by save
+
+    with mmap enabled, a read-only FrozenGraph is returned whose arrays are mapped straight from the file
+    (nothing is read until it is accessed). otherwise a mutable graph of the saved variant is rebuilt"""
+
+    with open(path, "rb") as file:
+        header = file.read(header_length)
+    if len(header) < header_length or header[:4] != magic:
+        raise ValueError(f"'{path}' is not a cc3 graph file")
+
+    (_, version, variant_code, flags, index_type, weight_type, _, order, size, arcs,
+     default) = struct.unpack_from(header_format, header)
+    if version != format_version:
+        raise ValueError(f"unsupported cc3 graph file version ({version})")
+
+    def read(offset: int, dtype, count: int) -> np.ndarray:
+        dtype = np.dtype(dtype).newbyteorder('<')
+        if mmap:
+            if count == 0:
+                return np.zeros(0, dtype = dtype)
+            return np.memmap(path, dtype = dtype, mode = 'r', offset = offset, shape = (count,))
+        return np.fromfile(path, dtype = dtype, count = count, offset = offset)
+
+    position = header_length
+    offsets = read(position, np.int64, order + 1)
+    position += _align(offsets.nbytes)
+
+    targets = read(position, index_types[index_type], arcs)
+    position += _align(targets.nbytes)
+
+    weights = None
+    if weight_types[weight_type] is not None:
+        weights = read(position, weight_types[weight_type], arcs)
+
+    variant = {code: name for name, code in variant_codes.items()}[variant_code]
+    default = None if flags & flag_default_none else (int(default) if default.is_integer() else default)
+
+    frozen = FrozenGraph(offsets, targets, weights, size, bool(flags & flag_weighted),
+                         bool(flags & flag_directed), variant, default)
+    return frozen if mmap else frozen.thaw()
@@ -1,10 +1,13 @@
+import numpy as np
 from collections import deque
 from collections.abc import Sequence
 from .graph import Graph, ListGraph, MatrixGraph, SuccessorGraph
+from .frozen import FrozenGraph, scalar_frontier, scalar_view, sorted_unique
+from .view import SubgraphView
 
 
 # BFS
-def bfs(graph: Graph | SuccessorGraph, anchor = 0) -> Sequence[int]:
+def bfs(graph: Graph | SuccessorGraph | FrozenGraph | SubgraphView, anchor = 0) -> Sequence[int]:
     """run the breadth-first search algorithm on a graph
 
     returns an array indicating all nodes' distance/depth from anchor. A value of -1 means that the node cannot be reached"""
@@ -20,6 +23,12 @@ def bfs(graph: Graph | SuccessorGraph, anchor = 0) -> Sequence[int]:
         return _bfs_matrix(graph, anchor)
     elif isinstance(graph, SuccessorGraph):
         return _bfs_successor(graph, anchor)
+    elif isinstance(graph, FrozenGraph):
+        return _bfs_frozen(graph, anchor)
+    elif isinstance(graph, SubgraphView):
+        if not graph.mask[anchor]:
+            raise IndexError("vertex is hidden by the subgraph view")
+        return _bfs_view(graph, anchor)
 
     raise NotImplementedError(f"bfs not supported for '{type(graph).__name__}'")
 
@@ -93,8 +102,60 @@ def _bfs_successor(graph: SuccessorGraph, anchor = 0) -> Sequence[int]:
     return dist
 
 
+def _bfs_frozen(graph: FrozenGraph, anchor = 0) -> Sequence[int]:
+    """bfs helper function for frozen graphs (processes one whole level at a time)
+
+    small levels are expanded with a scalar loop over the csr arrays, large levels in one vectorized step"""
+
+    dist = np.full(graph.order, -1, dtype = np.int64)
+    dist[anchor] = 0
+    frontier = [anchor]
+
+    offsets, targets, distances = scalar_view(graph.offsets), scalar_view(graph.targets), scalar_view(dist)
+
+    depth = 0
+    while len(frontier):
+        depth += 1
+        if len(frontier) < scalar_frontier:
+            reached = []
+            for v in frontier:
+                for w in targets[offsets[v]:offsets[v + 1]]:
+                    if distances[w] == -1:
+                        distances[w] = depth
+                        reached.append(w)
+            frontier = reached
+        else:
+            reached = graph.expand(np.asarray(frontier, dtype = np.int64))
+            frontier = sorted_unique(reached[dist[reached] == -1])
+            dist[frontier] = depth
+            frontier = frontier.tolist() if len(frontier) < scalar_frontier else frontier
+
+    return dist
+
+
+def _bfs_view(graph: SubgraphView, anchor = 0) -> Sequence[int]:
+    """bfs helper function for subgraph views"""
+
+    queue = deque()
+    dist = [-1] * graph.order
+    neighbours = graph.neighbours
+
+    queue.append(anchor)
+    dist[anchor] = 0
+
+    while len(queue) > 0:
+        current = queue.popleft()
+
+        for i in neighbours(current):
+            if dist[i] == -1:
+                queue.append(i)
+                dist[i] = dist[current] + 1
+
+    return dist
+
+
 # DFS
-def dfs(graph: Graph | SuccessorGraph, anchor = 0) -> Sequence[bool]:
+def dfs(graph: Graph | SuccessorGraph | FrozenGraph | SubgraphView, anchor = 0) -> Sequence[bool]:
     """run the depth-first search algorithm on a graph
 
     returns an array indicating whether each node can be reached from the anchor."""
@@ -104,19 +165,30 @@ def dfs(graph: Graph | SuccessorGraph, anchor = 0) -> Sequence[bool]:
     if not 0 <= anchor < graph.order:
         raise IndexError("vertex does not exist in graph")
 
+    if isinstance(graph, (ListGraph, MatrixGraph, SuccessorGraph)):
+        return _dfs_recursive(graph, anchor)
+    elif isinstance(graph, FrozenGraph):
+        return _dfs_frozen(graph, anchor)
+    elif isinstance(graph, SubgraphView):
+        if not graph.mask[anchor]:
+            raise IndexError("vertex is hidden by the subgraph view")
+        return _dfs_view(graph, anchor)
+
+    raise NotImplementedError(f"dfs not supported for '{type(graph).__name__}'")
+
+
+def _dfs_recursive(graph: Graph | SuccessorGraph, anchor = 0) -> Sequence[bool]:
+    """dfs helper function that runs the recursive kernel of a list, matrix or successor graph"""
+
     visited = [False] * graph.order
 
     if isinstance(graph, ListGraph):
         _dfs_list(graph, anchor, visited)
-        return visited
     elif isinstance(graph, MatrixGraph):
         _dfs_matrix(graph, anchor, visited)
-        return visited
-    elif isinstance(graph, SuccessorGraph):
+    else:
         _dfs_successor(graph, anchor, visited)
-        return visited
-
-    raise NotImplementedError(f"dfs not supported for '{type(graph).__name__}'")
+    return visited
 
 
 def _dfs_list(graph: ListGraph, current: int, visited: list[bool]) -> None:
@@ -147,4 +219,31 @@ def _dfs_successor(graph: SuccessorGraph, current: int, visited: list[bool]) ->
     if graph.adj[current] is not None:
         i = graph.adj[current].dest
         if not visited[i]:
-            _dfs_successor(graph, i, visited)
\ No newline at end of file
+            _dfs_successor(graph, i, visited)
+
+
+def _dfs_frozen(graph: FrozenGraph, anchor = 0) -> Sequence[bool]:
+    """dfs helper function for frozen graphs
+
+    reachability does not depend on the visiting order, so the vectorized bfs kernel is reused"""
+
+    return _bfs_frozen(graph, anchor) != -1
+
+
+def _dfs_view(graph: SubgraphView, anchor = 0) -> Sequence[bool]:
+    """dfs helper function for subgraph views (uses an explicit stack instead of recursion)"""
+
+    visited = [False] * graph.order
+    stack = [anchor]
+
+    while stack:
+        current = stack.pop()
+        if visited[current]:
+            continue
+        visited[current] = True
+
+        for i in reversed(graph.neighbours(current)):
+            if not visited[i]:
+                stack.append(i)
+
+    return visited
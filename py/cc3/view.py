@@ -0,0 +1,164 @@
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+from .graph import Graph, Edge, ListGraph, MatrixGraph, SuccessorGraph
+
+
+class SubgraphView:
+    """a filtered view of a ListGraph, MatrixGraph or SuccessorGraph that hides vertices and edges
+    without copying the graph
+
+    vertices keep their indices, hidden vertices are simply unreachable.
+    an edge [a->b] with weight w is visible if both ends are visible and, when given,
+    edge(a, b, w) is truthy and min_weight <= w <= max_weight.
+    the view reads the edges of the graph on every access, so it reflects later edge changes
+    (vertices added to the graph later are not part of the view)
+
+    NOTE: for undirected graphs the edge predicate should not depend on the direction of the edge"""
+
+    def __init__(self, graph: Graph | SuccessorGraph, vertices: Sequence[bool] | Iterable[int] | None = None,
+                 removed: Iterable[int] | None = None, edge: Callable[[int, int, Any], bool] | None = None,
+                 min_weight: Any = None, max_weight: Any = None) -> None:
+        if not isinstance(graph, (ListGraph, MatrixGraph, SuccessorGraph)):
+            raise NotImplementedError(f"subgraph views not supported for '{type(graph).__name__}'")
+
+        self.graph = graph
+        self.order = graph.order
+        self.weighted = graph.weighted
+        self.directed = True if isinstance(graph, SuccessorGraph) else graph.directed
+
+        self.mask = self._mask(vertices)
+        if removed is not None:
+            for v in removed:
+                self._check(v)
+                self.mask[v] = False
+
+        self.edge = edge
+        self.min_weight = min_weight
+        self.max_weight = max_weight
+        self.keep = self._predicate()
+
+    def _check(self, v: int) -> None:
+        if not 0 <= v < self.order:
+            raise IndexError(f"vertex ({v}) does not exist in graph")
+
+    def _mask(self, vertices: Sequence[bool] | Iterable[int] | None) -> list[bool]:
+        """helper function that turns a boolean mask or a collection of vertices into a list of booleans"""
+
+        if vertices is None:
+            return [True] * self.order
+
+        vertices = vertices.tolist() if hasattr(vertices, "tolist") else list(vertices)
+        if len(vertices) == self.order and all(isinstance(v, bool) for v in vertices):
+            return vertices
+
+        mask = [False] * self.order
+        for v in vertices:
+            self._check(v)
+            mask[v] = True
+        return mask
+
+    def _predicate(self) -> Callable[[int, int, Any], bool] | None:
+        """helper function that combines the edge filters into one predicate (None if every edge is visible)"""
+
+        edge, low, high = self.edge, self.min_weight, self.max_weight
+        if edge is None and low is None and high is None:
+            return None
+
+        def keep(a: int, b: int, w: Any) -> bool:
+            if low is not None and w < low:
+                return False
+            if high is not None and w > high:
+                return False
+            return edge is None or bool(edge(a, b, w))
+
+        return keep
+
+    @property
+    def version(self) -> int:
+        return self.graph.version
+
+    @property
+    def size(self) -> int:
+        """the number of visible edges (counted on every access)"""
+
+        if self.directed:
+            return sum(len(self.neighbours(v)) for v in range(self.order))
+
+        # undirected edges are seen from both ends, count them from their smaller end
+        return sum(1 for v in range(self.order) for w in set(self.neighbours(v)) if v <= w)
+
+    def contains(self, v: int) -> bool:
+        """returns whether vertex (v) is visible"""
+
+        return 0 <= v < self.order and self.mask[v]
+
+    # VERTEX ACCESS
+    def neighbours(self, v: int) -> list[int]:
+        """returns the visible vertices that the visible edges starting on (v) lead to"""
+
+        if not self.mask[v]:
+            return []
+
+        # vertices added to the graph after the view was created (index >= order) are hidden
+        graph, mask, keep, order = self.graph, self.mask, self.keep, self.order
+        if isinstance(graph, ListGraph):
+            if keep is None:
+                return [e.dest for e in graph.adj[v] if e.dest < order and mask[e.dest]]
+            return [e.dest for e in graph.adj[v] if e.dest < order and mask[e.dest] and keep(v, e.dest, e.weight)]
+
+        if isinstance(graph, MatrixGraph):
+            default = graph.default_value
+            row = graph.adj[v] if len(graph.adj[v]) == order else graph.adj[v][:order]
+            if keep is None:
+                return [i for i, w in enumerate(row) if w != default and mask[i]]
+            return [i for i, w in enumerate(row) if w != default and mask[i] and keep(v, i, w)]
+
+        e = graph.adj[v]
+        if e is None or e.dest >= order or not mask[e.dest] or (keep is not None and not keep(v, e.dest, e.weight)):
+            return []
+        return [e.dest]
+
+    def get_outgoing(self, v: int) -> list[int]:
+        self._check(v)
+        return self.neighbours(v)
+
+    def out_degree(self, v: int) -> int:
+        self._check(v)
+        return len(self.neighbours(v))
+
+    # EDGE ACCESS
+    def is_edge(self, a: int, b: int) -> bool:
+        if not (self.contains(a) and self.contains(b)) or not self.graph.is_edge(a, b):
+            return False
+        return self.keep is None or self.keep(a, b, self.graph.get_weight(a, b))
+
+    def get_weight(self, a: int, b: int) -> Any:
+        if not self.is_edge(a, b):
+            raise IndexError(f"edge [{a}->{b}] not in graph")
+        return self.graph.get_weight(a, b)
+
+    # CONVERSION
+    def to_list(self) -> ListGraph:
+        """returns a ListGraph with the visible edges (hidden vertices are kept, without edges)"""
+
+        graph = ListGraph(self.order, self.weighted, self.directed)
+        for v in range(self.order):
+            for w in dict.fromkeys(self.neighbours(v)):
+                graph.adj[v].append(Edge(v, w, self.graph.get_weight(v, w), graph))
+                if v == w and not self.directed:
+                    # undirected loops are stored twice in a ListGraph
+                    graph.adj[v].append(Edge(v, w, self.graph.get_weight(v, w), graph))
+        graph.size = self.size
+        return graph
+
+
+def subgraph(graph: Graph | SuccessorGraph, vertices: Sequence[bool] | Iterable[int] | None = None,
+             removed: Iterable[int] | None = None, edge: Callable[[int, int, Any], bool] | None = None,
+             min_weight: Any = None, max_weight: Any = None) -> SubgraphView:
+    """returns a view of a graph restricted to some vertices and edges, see SubgraphView
+
+    vertices is either a boolean mask or a collection of the vertices to keep (default: all of them),
+    removed is a collection of vertices to hide (e.g. failed nodes)"""
+
+    return SubgraphView(graph, vertices, removed, edge, min_weight, max_weight)